@@ -82,6 +82,21 @@ describe("WebSocketClient", () => {
     expect(messages[0]).toEqual(msg);
   });
 
+  it("dispatches each event of a batch frame in order", () => {
+    const { messages, callbacks } = setupCallbacks();
+    const client = new WebSocketClient("ws://test/ws", callbacks);
+
+    client.connect();
+    const ws = MockWebSocket.instances[0];
+    ws.simulateOpen();
+
+    const first = { type: "tick_update", tick: 5, entity_count: 10, is_paused: false };
+    const second = { type: "error", tick: 5, message: "boom" };
+    ws.simulateMessage({ type: "batch", events: [first, { invalid: true }, second] });
+
+    expect(messages).toEqual([first, second]);
+  });
+
   it("ignores invalid messages", () => {
     const { messages, callbacks } = setupCallbacks();
     const client = new WebSocketClient("ws://test/ws", callbacks);
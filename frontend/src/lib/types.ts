@@ -109,6 +109,11 @@ export type ServerMessage =
   | TickUpdateMessage
   | MetadataMessage;
 
+export interface BatchMessage {
+  type: "batch";
+  events: unknown[];
+}
+
 export type ClientCommand =
   | { command: "subscribe" }
   | { command: "pause" }
@@ -253,6 +258,10 @@ function isTickDelta(value: unknown): value is TickDelta {
   );
 }
 
+export function isBatchMessage(data: unknown): data is BatchMessage {
+  return isRecord(data) && data.type === "batch" && Array.isArray(data.events);
+}
+
 export function isServerMessage(data: unknown): data is ServerMessage {
   if (!isRecord(data) || !isString(data.type)) return false;
 
@@ -10,7 +10,7 @@ import type {
   WorldSnapshot,
   ServerMessage,
 } from "./types";
-import { isServerMessage } from "./types";
+import { isBatchMessage, isServerMessage } from "./types";
 
 export interface WebSocketCallbacks {
   onMessage: (msg: ServerMessage) => void;
@@ -75,22 +75,13 @@ export class WebSocketClient {
         return;
       }
 
-      if (isServerMessage(data)) {
-        if (data.type === "snapshot_response") {
-          this.handleSnapshotResponse(data);
-          return;
+      if (isBatchMessage(data)) {
+        for (const item of data.events) {
+          this.dispatch(item);
         }
-        this.callbacks.onMessage(data);
         return;
       }
-
-      if (
-        typeof data === "object" &&
-        data !== null &&
-        typeof (data as Record<string, unknown>).type === "string"
-      ) {
-        console.warn("[ws] unknown message type:", (data as Record<string, unknown>).type);
-      }
+      this.dispatch(data);
     };
 
     ws.onerror = (event: Event) => {
@@ -199,6 +190,25 @@ export class WebSocketClient {
     this.reconnectAttempts = 0;
   }
 
+  private dispatch(data: unknown): void {
+    if (isServerMessage(data)) {
+      if (data.type === "snapshot_response") {
+        this.handleSnapshotResponse(data);
+        return;
+      }
+      this.callbacks.onMessage(data);
+      return;
+    }
+
+    if (
+      typeof data === "object" &&
+      data !== null &&
+      typeof (data as Record<string, unknown>).type === "string"
+    ) {
+      console.warn("[ws] unknown message type:", (data as Record<string, unknown>).type);
+    }
+  }
+
   private handleSnapshotResponse(message: SnapshotResponseMessage): void {
     const pending = this.pendingSnapshotRequests.get(message.request_id);
     if (!pending) {
@@ -167,6 +167,10 @@ def cmd_serve(args: argparse.Namespace) -> int:
         host=args.host,
         port=args.port,
         log_level="debug" if args.verbose else "info",
+        # Same as uvicorn's default, pinned because streamed frames are repetitive
+        # JSON that deflate shrinks a lot. Each connection compresses its own
+        # frames; the JSON text is only shared while several clients are connected.
+        ws_per_message_deflate=True,
     )
 
     return 0
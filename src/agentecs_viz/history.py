@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import bisect
+import copy
 import logging
-from collections import deque
-from collections.abc import Sequence
-from typing import Any
+import operator
+import pickle  # nosec B403
+import zlib
+from collections import OrderedDict, deque
+from collections.abc import Collection, Hashable, Iterator, Sequence
+from typing import Any, NamedTuple, TypeVar
 
 from agentecs_viz.protocol import ErrorEventMessage, SpanEventMessage
 from agentecs_viz.snapshot import (
@@ -19,66 +23,162 @@ from agentecs_viz.snapshot import (
 
 logger = logging.getLogger(__name__)
 
+_EventT = TypeVar("_EventT")
+
+_entry_tick = operator.itemgetter(0)
+
+_ATOMIC_TYPES: frozenset[type] = frozenset({int, float, str, bool, type(None)})
+
+
+def _copy_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Copy component data, deep-copying only when some value is a container."""
+    for value in data.values():
+        if type(value) not in _ATOMIC_TYPES:
+            return copy.deepcopy(data)
+    return data.copy()
+
+
+def _clone_snapshot(snapshot: WorldSnapshot) -> WorldSnapshot:
+    """Deep-copy a snapshot without going through pydantic's copy machinery.
+
+    Models are rebuilt with ``model_construct`` and the result's ``by_id()``
+    index is seeded along the way.
+    """
+    entities: list[EntitySnapshot] = []
+    entities_by_id: dict[int, EntitySnapshot] = {}
+    for entity in snapshot.entities:
+        clone = EntitySnapshot.model_construct(
+            id=entity.id,
+            components=[
+                ComponentSnapshot.model_construct(
+                    type_name=comp.type_name,
+                    type_short=comp.type_short,
+                    data=_copy_data(comp.data),
+                )
+                for comp in entity.components
+            ],
+        )
+        entities.append(clone)
+        entities_by_id[entity.id] = clone
+
+    result = WorldSnapshot.model_construct(
+        tick=snapshot.tick,
+        timestamp=snapshot.timestamp,
+        entities=entities,
+        metadata=copy.deepcopy(snapshot.metadata),
+    )
+    result.__dict__["_entities_by_id"] = entities_by_id  # seed the by_id() cache
+    return result
+
 
 def _diff_entity(old: EntitySnapshot, new: EntitySnapshot) -> list[ComponentDiff]:
-    """Compute component-level diffs between two snapshots of the same entity."""
+    """Compute component-level diffs between two snapshots of the same entity.
+
+    Diffs are built with ``model_construct``: both sides are already-validated
+    snapshots, so their data is referenced rather than re-validated and copied.
+    Added and modified components follow ``new`` order, then removed ones follow
+    ``old`` order. Components (or data dicts) shared by identity between the two
+    sides are skipped without a deep comparison.
+    """
     diffs: list[ComponentDiff] = []
-    old_comps = {c.type_short: c for c in old.components}
-    new_comps = {c.type_short: c for c in new.components}
+    old_components = old.components
+    new_components = new.components
+    if len(old_components) == len(new_components):
+        # Same component types in the same order (an unchanged archetype, the
+        # common case) are compared positionally without building any index.
+        for before, after in zip(old_components, new_components, strict=True):
+            if before is after:
+                continue
+            if before.type_short != after.type_short:
+                diffs.clear()
+                break
+            if before.data is not after.data and before.data != after.data:
+                diffs.append(
+                    ComponentDiff.model_construct(
+                        component_type=after.type_short,
+                        type_name=after.type_name,
+                        old_value=before.data,
+                        new_value=after.data,
+                    )
+                )
+        else:
+            return diffs
 
-    for comp_type in sorted(set(old_comps) | set(new_comps)):
-        old_comp = old_comps.get(comp_type)
-        new_comp = new_comps.get(comp_type)
-        source_comp = new_comp or old_comp
-        assert source_comp is not None  # comp_type comes from their union
-        resolved_type_name = source_comp.type_name
+    old_comps = old.by_type()
+    matched = 0
 
+    for new_comp in new.components:
+        comp_type = new_comp.type_short
+        old_comp = old_comps.get(comp_type)
         if old_comp is None:
             diffs.append(
-                ComponentDiff(
+                ComponentDiff.model_construct(
                     component_type=comp_type,
-                    type_name=resolved_type_name,
+                    type_name=new_comp.type_name,
                     old_value=None,
-                    new_value=new_comp.data if new_comp else None,
-                )
-            )
-        elif new_comp is None:
-            diffs.append(
-                ComponentDiff(
-                    component_type=comp_type,
-                    type_name=resolved_type_name,
-                    old_value=old_comp.data,
-                    new_value=None,
+                    new_value=new_comp.data,
                 )
             )
-        elif old_comp.data != new_comp.data:
+            continue
+        matched += 1
+        if old_comp.data is not new_comp.data and old_comp.data != new_comp.data:
             diffs.append(
-                ComponentDiff(
+                ComponentDiff.model_construct(
                     component_type=comp_type,
-                    type_name=resolved_type_name,
+                    type_name=new_comp.type_name,
                     old_value=old_comp.data,
                     new_value=new_comp.data,
                 )
             )
 
+    if matched < len(old_comps):
+        new_types = new.by_type()
+        for comp_type, old_comp in old_comps.items():
+            if comp_type not in new_types:
+                diffs.append(
+                    ComponentDiff.model_construct(
+                        component_type=comp_type,
+                        type_name=old_comp.type_name,
+                        old_value=old_comp.data,
+                        new_value=None,
+                    )
+                )
+
     return diffs
 
 
-def _compute_delta(old: WorldSnapshot, new: WorldSnapshot) -> TickDelta:
-    old_ids = {e.id: e for e in old.entities}
-    new_ids = {e.id: e for e in new.entities}
+def compute_delta(old: WorldSnapshot, new: WorldSnapshot) -> TickDelta:
+    """Compute the delta that turns ``old`` into ``new``.
 
-    spawned = [e for e in new.entities if e.id not in old_ids]
-    destroyed = [eid for eid in old_ids if eid not in new_ids]
+    Identical snapshots short-circuit to an empty delta, and entities shared by
+    identity between the two are not diffed at all.
+    """
+    if old is new or old.entities is new.entities:
+        return TickDelta.model_construct(
+            tick=new.tick, timestamp=new.timestamp, spawned=[], destroyed=[], modified={}
+        )
+
+    old_ids = old.by_id()
+    new_ids = new.by_id()
+
+    if old_ids.keys() == new_ids.keys():
+        # Same population (the common quiet tick): nothing spawned or destroyed.
+        spawned: list[EntitySnapshot] = []
+        destroyed: list[int] = []
+    else:
+        spawned = [e for e in new.entities if e.id not in old_ids]
+        destroyed = [eid for eid in old_ids if eid not in new_ids]
 
     modified: dict[int, list[ComponentDiff]] = {}
     for eid, new_entity in new_ids.items():
-        if eid in old_ids:
-            diffs = _diff_entity(old_ids[eid], new_entity)
+        old_entity = old_ids.get(eid)
+        # Copy-on-write sources reuse unchanged entity objects between ticks.
+        if old_entity is not None and old_entity is not new_entity:
+            diffs = _diff_entity(old_entity, new_entity)
             if diffs:
                 modified[eid] = diffs
 
-    return TickDelta(
+    return TickDelta.model_construct(
         tick=new.tick,
         timestamp=new.timestamp,
         spawned=spawned,
@@ -88,8 +188,13 @@ def _compute_delta(old: WorldSnapshot, new: WorldSnapshot) -> TickDelta:
 
 
 def _apply_delta(snapshot: WorldSnapshot, delta: TickDelta) -> WorldSnapshot:
-    """Apply a TickDelta to a snapshot to produce the next snapshot."""
-    entities_by_id = {e.id: e.model_copy(deep=True) for e in snapshot.entities}
+    """Apply a TickDelta to a snapshot to produce the next snapshot.
+
+    Copy-on-write: only entities named in ``delta.modified`` are rebuilt. Every
+    other entity, and the unchanged components of modified ones, is shared with
+    ``snapshot`` or ``delta``; neither input is mutated.
+    """
+    entities_by_id = dict(snapshot.by_id())
 
     for eid in delta.destroyed:
         entities_by_id.pop(eid, None)
@@ -98,40 +203,129 @@ def _apply_delta(snapshot: WorldSnapshot, delta: TickDelta) -> WorldSnapshot:
         entity = entities_by_id.get(eid)
         if entity is None:
             continue
-        comps_by_type = {c.type_short: c for c in entity.components}
+        comps_by_type = dict(entity.by_type())
 
         for diff in diffs:
-            if diff.old_value is None and diff.new_value is not None:
-                comps_by_type[diff.component_type] = ComponentSnapshot(
+            if diff.new_value is None:
+                comps_by_type.pop(diff.component_type, None)
+            else:
+                comps_by_type[diff.component_type] = ComponentSnapshot.model_construct(
                     type_name=diff.type_name,
                     type_short=diff.component_type,
                     data=diff.new_value,
                 )
-            elif diff.new_value is None:
-                comps_by_type.pop(diff.component_type, None)
-            elif diff.new_value is not None:
-                comp = comps_by_type.get(diff.component_type)
-                if comp:
-                    comp.data = diff.new_value
-                else:
-                    comps_by_type[diff.component_type] = ComponentSnapshot(
-                        type_name=diff.type_name,
-                        type_short=diff.component_type,
-                        data=diff.new_value,
-                    )
 
-        entity.components = list(comps_by_type.values())
+        rebuilt = EntitySnapshot.model_construct(id=eid, components=list(comps_by_type.values()))
+        rebuilt.__dict__["_components_by_type"] = comps_by_type  # seed the by_type() cache
+        entities_by_id[eid] = rebuilt
 
     for entity in delta.spawned:
-        entities_by_id[entity.id] = entity.model_copy(deep=True)
+        entities_by_id[entity.id] = entity
 
-    entities = list(entities_by_id.values())
-    return WorldSnapshot(
+    result = WorldSnapshot.model_construct(
         tick=delta.tick,
         timestamp=delta.timestamp,
-        entities=entities,
+        entities=list(entities_by_id.values()),
         metadata=snapshot.metadata,
     )
+    result.__dict__["_entities_by_id"] = entities_by_id  # seed the by_id() cache
+    return result
+
+
+def _insert_tick(ticks: list[int], tick: int) -> None:
+    """Insert a new tick into a sorted tick list; in-order ticks append directly."""
+    if not ticks or tick > ticks[-1]:
+        ticks.append(tick)
+    else:
+        bisect.insort(ticks, tick)
+
+
+def _remove_tick(ticks: list[int], tick: int) -> None:
+    """Remove a tick from a sorted tick list if present."""
+    idx = bisect.bisect_left(ticks, tick)
+    if idx < len(ticks) and ticks[idx] == tick:
+        del ticks[idx]
+
+
+def _events_in_range(
+    events_by_tick: dict[int, list[_EventT]],
+    ticks: list[int],
+    start_tick: int,
+    end_tick: int,
+) -> list[_EventT]:
+    """Collect events in [start_tick, end_tick] by walking only the stored ticks in range."""
+    if start_tick == end_tick:
+        return list(events_by_tick.get(start_tick, ()))
+    lo = bisect.bisect_left(ticks, start_tick)
+    hi = bisect.bisect_right(ticks, end_tick, lo)
+    result: list[_EventT] = []
+    extend = result.extend
+    for tick in ticks[lo:hi]:
+        extend(events_by_tick[tick])
+    return result
+
+
+def _index_entity_event(
+    index: dict[Any, list[tuple[int, _EventT]]],
+    entity_id: Any,
+    tick: int,
+    event: _EventT,
+) -> None:
+    """Add an event to an entity's (tick, event) list, kept sorted by tick."""
+    entries = index.setdefault(entity_id, [])
+    if not entries or tick >= entries[-1][0]:
+        entries.append((tick, event))
+    else:
+        bisect.insort_right(entries, (tick, event), key=_entry_tick)
+
+
+def _entity_events_in_range(
+    entries: list[tuple[int, _EventT]], start_tick: int, end_tick: int
+) -> list[_EventT]:
+    lo = bisect.bisect_left(entries, start_tick, key=_entry_tick)
+    hi = bisect.bisect_right(entries, end_tick, lo, key=_entry_tick)
+    return [event for _, event in entries[lo:hi]]
+
+
+def _drop_entity_events(
+    index: dict[Any, list[tuple[int, _EventT]]], entity_id: Any, tick: int
+) -> None:
+    """Remove an entity's events at ``tick``, dropping the entity once it has none."""
+    entries = index.get(entity_id)
+    if entries is None:
+        return
+    lo = bisect.bisect_left(entries, tick, key=_entry_tick)
+    hi = bisect.bisect_right(entries, tick, lo, key=_entry_tick)
+    del entries[lo:hi]
+    if not entries:
+        del index[entity_id]
+
+
+def _span_entity_id(span: SpanEventMessage) -> Hashable | None:
+    entity_id = span.attributes.get("agentecs.entity_id")
+    if type(entity_id) is int:
+        return entity_id
+    return entity_id if isinstance(entity_id, Hashable) else None
+
+
+# Cold checkpoints must read back exactly like hot ones; a JSON round trip would
+# turn NaN into None, tuples into lists and int keys into strings. Blobs never
+# leave the store, so unpickling them is as trusted as the live snapshot was
+# (hence the bandit B403/B301 suppressions).
+def _compress_snapshot(snapshot: WorldSnapshot) -> bytes:
+    return zlib.compress(pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL), 1)
+
+
+def _decompress_snapshot(blob: bytes) -> WorldSnapshot:
+    snapshot: WorldSnapshot = pickle.loads(zlib.decompress(blob))  # nosec B301
+    return snapshot
+
+
+class _TickEntry(NamedTuple):
+    """One stored tick: a checkpoint (live or compressed) or the delta from the previous tick."""
+
+    tick: int
+    payload: WorldSnapshot | bytes | TickDelta
 
 
 class InMemoryHistoryStore:
@@ -139,26 +333,62 @@ class InMemoryHistoryStore:
 
     Full snapshots stored at checkpoint_interval; deltas in between.
     Reconstructs any tick by replaying deltas from nearest checkpoint.
+
+    With ``adaptive_checkpoint_ratio`` set, a checkpoint is also taken early once
+    the entities touched by deltas since the last checkpoint exceed that ratio of
+    the current entity count, but never within ``min_checkpoint_interval`` ticks.
+
+    With ``hot_checkpoints`` set, only that many of the newest checkpoints stay
+    live; older ones are pickled and zlib-compressed, and inflated on demand.
     """
 
     def __init__(
         self,
         max_ticks: int = 10_000,
         checkpoint_interval: int = 100,
+        adaptive_checkpoint_ratio: float | None = None,
+        min_checkpoint_interval: int = 1,
+        hot_checkpoints: int | None = None,
     ) -> None:
         self._max_ticks = max_ticks
         self._checkpoint_interval = checkpoint_interval
-        self._checkpoints: dict[int, WorldSnapshot] = {}
-        self._checkpoint_ticks: list[int] = []  # sorted for bisect
-        self._deltas: dict[int, TickDelta] = {}
+        self._adaptive_checkpoint_ratio = adaptive_checkpoint_ratio
+        self._min_checkpoint_interval = min_checkpoint_interval
+        # Replay cost accumulated since the newest checkpoint.
+        self._deltas_since_checkpoint = 0
+        self._replay_weight = 0
+        # Ring of stored ticks: grows to max_ticks, then wraps with the oldest at _head.
+        self._ring: list[_TickEntry] = []
+        self._head = 0
+        self._count = 0
+        self._tick_to_slot: dict[int, int] = {}
+        # Sorted for bisect; evictions pop the front and new checkpoints append at the back.
+        self._checkpoint_ticks: deque[int] = deque()
         self._errors: dict[int, list[ErrorEventMessage]] = {}
+        self._error_ticks: list[int] = []  # sorted for bisect
         self._spans: dict[int, list[SpanEventMessage]] = {}
-        self._tick_order: deque[int] = deque()
+        self._span_ticks: list[int] = []  # sorted for bisect
+        # Per-entity (tick, event) lists, sorted by tick.
+        self._errors_by_entity: dict[int, list[tuple[int, ErrorEventMessage]]] = {}
+        self._spans_by_entity: dict[Any, list[tuple[int, SpanEventMessage]]] = {}
         self._last_snapshot: WorldSnapshot | None = None
+        # Reconstructed delta ticks, LRU-ordered; entries share structure with history.
+        self._recon_cache: OrderedDict[int, WorldSnapshot] = OrderedDict()
+        self._recon_cache_size = max(1, checkpoint_interval)
+        self._hot_checkpoints = hot_checkpoints
+        # Recently inflated cold checkpoints, LRU-ordered.
+        self._inflated: OrderedDict[int, WorldSnapshot] = OrderedDict()
+        # While the oldest stored tick is a delta: the evicted checkpoint it
+        # builds on, plus evicted deltas still to be replayed on top of it.
+        self._front_base: tuple[int, WorldSnapshot | bytes] | None = None
+        self._front_deltas: list[TickDelta] = []
+        # Bumped whenever the stored ticks change; keys derived results.
+        self._version = 0
+        self._lifecycles: tuple[int, list[dict[str, Any]]] | None = None
 
     @property
     def tick_count(self) -> int:
-        return len(self._tick_order)
+        return self._count
 
     @property
     def max_ticks(self) -> int:
@@ -171,64 +401,126 @@ class InMemoryHistoryStore:
     @property
     def stored_ticks(self) -> Sequence[int]:
         """Ordered sequence of stored tick numbers."""
-        return tuple(self._tick_order)
+        return tuple(self._tick_at(pos) for pos in range(self._count))
+
+    def _slot(self, pos: int) -> int:
+        """Ring slot holding the ``pos``-th oldest stored tick."""
+        return (self._head + pos) % self._max_ticks
+
+    def _tick_at(self, pos: int) -> int:
+        return self._ring[self._slot(pos)].tick
 
     def record_tick(self, snapshot: WorldSnapshot) -> None:
-        """Record a world snapshot as checkpoint or delta."""
+        """Record a world snapshot as checkpoint or delta.
+
+        The snapshot is stored by reference and must not be mutated afterwards;
+        ``get_snapshot`` hands out independent copies.
+        """
         tick = snapshot.tick
-        if tick in self._checkpoints or tick in self._deltas:
-            return
-        if self._tick_order and tick <= self._tick_order[-1]:
-            logger.warning(
-                "Ignoring out-of-order snapshot tick %s (last stored tick is %s)",
-                tick,
-                self._tick_order[-1],
-            )
+        if self._count:
+            last_tick = self._tick_at(self._count - 1)
+            # Stored ticks are strictly increasing, so a repeat can only be the last one.
+            if tick == last_tick:
+                return
+            if tick < last_tick:
+                logger.warning(
+                    "Ignoring out-of-order snapshot tick %s (last stored tick is %s)",
+                    tick,
+                    last_tick,
+                )
+                return
+        if self._max_ticks <= 0:
             return
-        is_first = len(self._tick_order) == 0
-        is_checkpoint = is_first or (tick % self._checkpoint_interval == 0)
-
-        if is_checkpoint:
-            self._checkpoints[tick] = snapshot.model_copy(deep=True)
-            bisect.insort(self._checkpoint_ticks, tick)
-        elif self._last_snapshot is not None:
-            delta = _compute_delta(self._last_snapshot, snapshot)
-            self._deltas[tick] = delta
+        if self._count == self._max_ticks:
+            self._evict_oldest()
 
-        self._tick_order.append(tick)
-        self._last_snapshot = snapshot.model_copy(deep=True)
+        entry: _TickEntry | None = None
+        if self._count and self._last_snapshot is not None and tick % self._checkpoint_interval:
+            delta = compute_delta(self._last_snapshot, snapshot)
+            if not self._checkpoint_is_cheaper(delta, snapshot):
+                entry = _TickEntry(tick, delta)
+        if entry is None:
+            entry = _TickEntry(tick, snapshot)
+            self._checkpoint_ticks.append(tick)
+            self._deltas_since_checkpoint = 0
+            self._replay_weight = 0
+
+        slot = self._slot(self._count)
+        if slot == len(self._ring):
+            self._ring.append(entry)
+        else:
+            self._ring[slot] = entry
+        self._tick_to_slot[tick] = slot
+        self._count += 1
+        self._version += 1
+        self._last_snapshot = snapshot
+        if entry.payload is snapshot:
+            self._compress_cold_checkpoint()
+
+    def _compress_cold_checkpoint(self) -> None:
+        """Compress the newest checkpoint that fell out of the hot set, if any."""
+        if self._hot_checkpoints is None or len(self._checkpoint_ticks) <= self._hot_checkpoints:
+            return
+        cold_tick = self._checkpoint_ticks[-self._hot_checkpoints - 1]
+        slot = self._tick_to_slot[cold_tick]
+        payload = self._ring[slot].payload
+        if isinstance(payload, WorldSnapshot):
+            self._ring[slot] = _TickEntry(cold_tick, _compress_snapshot(payload))
+
+    def _load_checkpoint(self, tick: int, payload: WorldSnapshot | bytes) -> WorldSnapshot:
+        if isinstance(payload, WorldSnapshot):
+            return payload
+        snapshot = self._inflated.get(tick)
+        if snapshot is not None:
+            self._inflated.move_to_end(tick)
+            return snapshot
+        snapshot = _decompress_snapshot(payload)
+        self._inflated[tick] = snapshot
+        while len(self._inflated) > 2:
+            self._inflated.popitem(last=False)
+        return snapshot
 
-        while len(self._tick_order) > self._max_ticks:
-            self._evict_oldest()
+    def _checkpoint_is_cheaper(self, delta: TickDelta, snapshot: WorldSnapshot) -> bool:
+        """Add ``delta`` to the replay cost; True if ``snapshot`` should be a checkpoint."""
+        self._deltas_since_checkpoint += 1
+        self._replay_weight += len(delta.spawned) + len(delta.destroyed) + len(delta.modified)
+        if self._adaptive_checkpoint_ratio is None:
+            return False
+        if self._deltas_since_checkpoint < self._min_checkpoint_interval:
+            return False
+        return self._replay_weight > self._adaptive_checkpoint_ratio * len(snapshot.entities)
 
     def record_error(self, error: ErrorEventMessage) -> None:
         """Record an error event at its tick."""
-        self._errors.setdefault(error.tick, []).append(error)
+        errors = self._errors.get(error.tick)
+        if errors is None:
+            errors = self._errors[error.tick] = []
+            _insert_tick(self._error_ticks, error.tick)
+        errors.append(error)
+        _index_entity_event(self._errors_by_entity, error.entity_id, error.tick, error)
 
     def get_errors(self, start_tick: int, end_tick: int) -> list[ErrorEventMessage]:
         """Return all errors in [start_tick, end_tick] inclusive."""
-        result: list[ErrorEventMessage] = []
-        for tick in sorted(self._errors):
-            if tick < start_tick:
-                continue
-            if tick > end_tick:
-                break
-            result.extend(self._errors[tick])
-        return result
+        return _events_in_range(self._errors, self._error_ticks, start_tick, end_tick)
 
     def get_errors_for_entity(
         self, entity_id: int, start_tick: int, end_tick: int
     ) -> list[ErrorEventMessage]:
         """Return errors for a specific entity in [start_tick, end_tick] inclusive."""
-        return [e for e in self.get_errors(start_tick, end_tick) if e.entity_id == entity_id]
+        entries = self._errors_by_entity.get(entity_id)
+        if entries is None:
+            return []
+        return _entity_events_in_range(entries, start_tick, end_tick)
 
     def record_span(self, span: SpanEventMessage) -> None:
         """Record a span event at its tick (from attributes)."""
         raw_tick = span.attributes.get("agentecs.tick", 0)
         tick = 0
-        if isinstance(raw_tick, bool):
+        if type(raw_tick) is int:  # the common case; excludes bool
+            tick = raw_tick
+        elif isinstance(raw_tick, bool):
             logger.warning("Invalid span tick %r; recording at tick 0", raw_tick)
-        elif isinstance(raw_tick, int | float):
+        elif isinstance(raw_tick, (int, float)):
             tick = int(raw_tick)
         elif isinstance(raw_tick, str):
             try:
@@ -237,125 +529,234 @@ class InMemoryHistoryStore:
                 logger.warning("Invalid span tick %r; recording at tick 0", raw_tick)
         else:
             logger.warning("Invalid span tick %r; recording at tick 0", raw_tick)
-        self._spans.setdefault(tick, []).append(span)
+        spans = self._spans.get(tick)
+        if spans is None:
+            spans = self._spans[tick] = []
+            _insert_tick(self._span_ticks, tick)
+        spans.append(span)
+        entity_id = _span_entity_id(span)
+        if entity_id is not None:
+            _index_entity_event(self._spans_by_entity, entity_id, tick, span)
 
     def get_spans(self, start_tick: int, end_tick: int) -> list[SpanEventMessage]:
         """Return all spans in [start_tick, end_tick] inclusive."""
-        result: list[SpanEventMessage] = []
-        for tick in sorted(self._spans):
-            if tick < start_tick:
-                continue
-            if tick > end_tick:
-                break
-            result.extend(self._spans[tick])
-        return result
+        return _events_in_range(self._spans, self._span_ticks, start_tick, end_tick)
 
     def get_spans_for_entity(
         self, entity_id: int, start_tick: int, end_tick: int
     ) -> list[SpanEventMessage]:
         """Return spans for a specific entity in [start_tick, end_tick] inclusive."""
-        return [
-            s
-            for s in self.get_spans(start_tick, end_tick)
-            if s.attributes.get("agentecs.entity_id") == entity_id
-        ]
+        entries = self._spans_by_entity.get(entity_id)
+        if entries is None:
+            return []
+        return _entity_events_in_range(entries, start_tick, end_tick)
 
     def _evict_oldest(self) -> None:
-        """Evict oldest tick, promoting next tick to checkpoint if needed."""
-        if not self._tick_order:
+        """Evict the oldest tick, keeping its checkpoint aside while deltas still lead."""
+        if not self._count:
             return
 
-        old_tick = self._tick_order.popleft()
-        self._errors.pop(old_tick, None)
-        self._spans.pop(old_tick, None)
-        was_checkpoint = old_tick in self._checkpoints
-
-        if was_checkpoint:
-            old_snapshot = self._checkpoints.pop(old_tick)
-            idx = bisect.bisect_left(self._checkpoint_ticks, old_tick)
-            if idx < len(self._checkpoint_ticks) and self._checkpoint_ticks[idx] == old_tick:
-                self._checkpoint_ticks.pop(idx)
-            # If the next tick exists and is a delta, promote it to a checkpoint
-            if self._tick_order:
-                next_tick = self._tick_order[0]
-                if next_tick in self._deltas:
-                    delta = self._deltas.pop(next_tick)
-                    promoted = _apply_delta(old_snapshot, delta)
-                    self._checkpoints[next_tick] = promoted
-                    bisect.insort(self._checkpoint_ticks, next_tick)
+        # The slot is left in place; record_tick overwrites it right after.
+        entry = self._ring[self._head]
+        old_tick = entry.tick
+        del self._tick_to_slot[old_tick]
+        self._head = (self._head + 1) % self._max_ticks
+        self._count -= 1
+        self._recon_cache.pop(old_tick, None)
+        errors = self._errors.pop(old_tick, None)
+        if errors is not None:
+            _remove_tick(self._error_ticks, old_tick)
+            for error in errors:
+                _drop_entity_events(self._errors_by_entity, error.entity_id, old_tick)
+        spans = self._spans.pop(old_tick, None)
+        if spans is not None:
+            _remove_tick(self._span_ticks, old_tick)
+            for span in spans:
+                span_entity = _span_entity_id(span)
+                if span_entity is not None:
+                    _drop_entity_events(self._spans_by_entity, span_entity, old_tick)
+
+        # Leading deltas are not promoted to a checkpoint eagerly: the evicted
+        # base is kept aside and only replayed when a leading tick is read, or
+        # when the pending chain reaches checkpoint_interval.
+        if isinstance(entry.payload, TickDelta):
+            self._front_deltas.append(entry.payload)
         else:
-            self._deltas.pop(old_tick, None)
+            # Once no delta leads, the oldest stored tick is the oldest checkpoint.
+            self._checkpoint_ticks.popleft()
+            self._front_base = (old_tick, entry.payload)
+            self._front_deltas.clear()
+        if not self._count or not isinstance(self._ring[self._head].payload, TickDelta):
+            if self._front_base is not None:
+                self._inflated.pop(self._front_base[0], None)
+            self._front_base = None
+            self._front_deltas.clear()
+        elif len(self._front_deltas) >= self._checkpoint_interval:
+            self._materialize_front_base()
+
+    def _materialize_front_base(self) -> WorldSnapshot | None:
+        """Replay pending evicted deltas onto the front base and return it."""
+        if self._front_base is None:
+            return None
+        base_tick, payload = self._front_base
+        snapshot = self._load_checkpoint(base_tick, payload)
+        if self._front_deltas:
+            for delta in self._front_deltas:
+                snapshot = _apply_delta(snapshot, delta)
+            self._inflated.pop(base_tick, None)
+            self._front_base = (self._front_deltas[-1].tick, snapshot)
+            self._front_deltas.clear()
+        return snapshot
 
     def get_snapshot(self, tick: int) -> WorldSnapshot | None:
         """Reconstruct world snapshot at the given tick."""
-        if tick not in self._checkpoints and tick not in self._deltas:
+        snapshot = self._reconstruct(tick)
+        if snapshot is None:
             return None
+        return _clone_snapshot(snapshot)
 
-        if tick in self._checkpoints:
-            return self._checkpoints[tick].model_copy(deep=True)
+    def _iter_entity_changes(
+        self,
+    ) -> Iterator[tuple[int, Sequence[EntitySnapshot], Collection[int]]]:
+        """Yield (tick, spawned entities, destroyed ids) for each stored tick in order.
+
+        Delta ticks report their recorded spawned/destroyed lists directly; only
+        checkpoint ticks are diffed by id against the running id set. The first
+        stored tick reports all of its entities as spawned.
+        """
+        ids: set[int] = set()
+        for pos in range(self._count):
+            entry = self._ring[self._slot(pos)]
+            if pos and isinstance(entry.payload, TickDelta):
+                spawned: Sequence[EntitySnapshot] = entry.payload.spawned
+                destroyed: Collection[int] = entry.payload.destroyed
+                ids.difference_update(destroyed)
+                ids.update(e.id for e in spawned)
+            else:
+                snapshot = self._reconstruct(entry.tick)
+                current = snapshot.by_id() if snapshot is not None else {}
+                spawned = [e for eid, e in current.items() if eid not in ids]
+                destroyed = ids - current.keys()
+                ids = set(current)
+            yield entry.tick, spawned, destroyed
+
+    def _reconstruct(self, tick: int) -> WorldSnapshot | None:
+        """Return the snapshot at ``tick`` without copying it out of history."""
+        slot = self._tick_to_slot.get(tick)
+        if slot is None:
+            return None
+        target = self._ring[slot].payload
+        if not isinstance(target, TickDelta):
+            return self._load_checkpoint(tick, target)
+
+        cached = self._recon_cache.get(tick)
+        if cached is not None:
+            self._recon_cache.move_to_end(tick)
+            return cached
 
         # O(log N) checkpoint lookup via bisect
         idx = bisect.bisect_right(self._checkpoint_ticks, tick) - 1
-        if idx < 0:
+        if idx >= 0:
+            base_tick = self._checkpoint_ticks[idx]
+        elif self._front_base is not None:
+            # A leading delta: replay from the evicted base kept by _evict_oldest.
+            base_tick = self._front_base[0]
+        else:
             return None
-        checkpoint_tick = self._checkpoint_ticks[idx]
-
-        snapshot = self._checkpoints[checkpoint_tick].model_copy(deep=True)
-        ticks = self.stored_ticks
-        start_idx = bisect.bisect_right(ticks, checkpoint_tick)
-        end_idx = bisect.bisect_right(ticks, tick)
-        for t in ticks[start_idx:end_idx]:
-            if t in self._deltas:
-                snapshot = _apply_delta(snapshot, self._deltas[t])
+        snapshot: WorldSnapshot | None = None
+
+        # Resume from the closest reconstruction already cached past the checkpoint.
+        for cached_tick, cached in self._recon_cache.items():
+            if base_tick < cached_tick < tick:
+                base_tick, snapshot = cached_tick, cached
+        if snapshot is not None:
+            cur = (self._tick_to_slot[base_tick] + 1) % self._max_ticks
+        elif idx < 0:
+            snapshot = self._materialize_front_base()
+            if snapshot is None:
+                return None
+            cur = self._head
+        else:
+            base_slot = self._tick_to_slot[base_tick]
+            base = self._ring[base_slot].payload
+            if isinstance(base, TickDelta):
+                return None
+            snapshot = self._load_checkpoint(base_tick, base)
+            cur = (base_slot + 1) % self._max_ticks
+
+        # Every tick after the base up to the target is a delta.
+        while True:
+            entry = self._ring[cur]
+            if isinstance(entry.payload, TickDelta):
+                snapshot = _apply_delta(snapshot, entry.payload)
+                self._cache_reconstruction(entry.tick, snapshot)
+            if cur == slot:
+                break
+            cur = (cur + 1) % self._max_ticks
 
         return snapshot
 
+    def _cache_reconstruction(self, tick: int, snapshot: WorldSnapshot) -> None:
+        self._recon_cache[tick] = snapshot
+        self._recon_cache.move_to_end(tick)
+        while len(self._recon_cache) > self._recon_cache_size:
+            self._recon_cache.popitem(last=False)
+
     def get_tick_range(self) -> tuple[int, int] | None:
-        if not self._tick_order:
+        if not self._count:
             return None
-        return self._tick_order[0], self._tick_order[-1]
+        return self._tick_at(0), self._tick_at(self._count - 1)
 
     def clear(self) -> None:
-        self._checkpoints.clear()
+        self._ring.clear()
+        self._head = 0
+        self._count = 0
+        self._tick_to_slot.clear()
         self._checkpoint_ticks.clear()
-        self._deltas.clear()
         self._errors.clear()
+        self._error_ticks.clear()
         self._spans.clear()
-        self._tick_order.clear()
+        self._span_ticks.clear()
+        self._errors_by_entity.clear()
+        self._spans_by_entity.clear()
+        self._recon_cache.clear()
+        self._inflated.clear()
+        self._front_base = None
+        self._front_deltas.clear()
+        self._deltas_since_checkpoint = 0
+        self._replay_weight = 0
         self._last_snapshot = None
+        self._version += 1
+        self._lifecycles = None
 
 
 def compute_entity_lifecycles(
     store: InMemoryHistoryStore,
 ) -> list[dict[str, Any]]:
-    """Compute entity spawn/despawn ticks from stored history."""
-    if not store.stored_ticks:
-        return []
-
-    lifecycles: dict[int, dict[str, Any]] = {}
-    previous_ids: set[int] = set()
+    """Compute entity spawn/despawn ticks from stored history.
 
-    for tick in store.stored_ticks:
-        snapshot = store.get_snapshot(tick)
-        if not snapshot:
-            continue
+    The result is cached on the store until the stored ticks change.
+    """
+    cached = store._lifecycles
+    if cached is None or cached[0] != store._version:
+        cached = (store._version, _entity_lifecycles(store))
+        store._lifecycles = cached
+    return [dict(lifecycle) for lifecycle in cached[1]]
 
-        current_ids = {e.id for e in snapshot.entities}
 
-        for entity_id in current_ids - previous_ids:
-            entity = next(e for e in snapshot.entities if e.id == entity_id)
-            archetype = ",".join(entity.archetype)
-            lifecycles[entity_id] = {
-                "entity_id": entity_id,
+def _entity_lifecycles(store: InMemoryHistoryStore) -> list[dict[str, Any]]:
+    lifecycles: dict[int, dict[str, Any]] = {}
+    for tick, spawned, destroyed in store._iter_entity_changes():
+        for entity in spawned:
+            lifecycles[entity.id] = {
+                "entity_id": entity.id,
                 "spawn_tick": tick,
                 "despawn_tick": None,
-                "archetype": archetype,
+                "archetype": ",".join(entity.archetype),
             }
 
-        for entity_id in previous_ids - current_ids:
+        for entity_id in destroyed:
             if entity_id in lifecycles:
                 lifecycles[entity_id]["despawn_tick"] = tick
 
-        previous_ids = current_ids
-
     return list(lifecycles.values())
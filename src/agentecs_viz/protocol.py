@@ -10,7 +10,10 @@ Each WebSocket connection to ``/ws`` starts a new protocol session:
 4. Server begins streaming events while also accepting client commands.
 
 The initial ``snapshot`` is a full world state at the current tick and should be
-treated as the base state for subsequent incremental updates.
+treated as the base state for subsequent incremental updates. The server streams
+world state as ``delta`` frames computed against the last state it sent on the
+connection, with a full ``snapshot`` keyframe every 100 frames, after a ``seek``
+reply, and after any source-emitted ``delta``.
 
 Client commands
 ---------------
@@ -38,12 +41,17 @@ All server messages are discriminated by the ``type`` field:
   (config, tick range, pause/history support)
 - ``snapshot``: full world snapshot at a tick
 - ``snapshot_response``: tagged historical snapshot keyed by ``request_id``
-- ``delta``: incremental world update for a tick (source-dependent)
+- ``delta``: incremental world update for a tick, applied to the client's
+  current state (generated by the server, or emitted by the source)
 - ``tick_update``: current tick summary and pause state
 - ``error``: protocol-level or command validation error text
 - ``error_event``: world/runtime error event with entity id and severity
 - ``span_event``: tracing span event with timing, status, and attributes
 
+Streamed events that are ready at the same time may be coalesced into one
+``batch`` frame whose ``events`` list holds the messages in send order.
+Command responses and the bootstrap pair are never batched.
+
 Ordering and reconnection
 -------------------------
 - WebSocket frames on a single connection are delivered in send order.
@@ -55,10 +63,16 @@ Ordering and reconnection
 
 Backpressure behavior
 ---------------------
-The protocol has no explicit end-to-end backpressure negotiation. Sources using
-``TickLoopSource`` fan out events through bounded per-subscriber queues. When a
-subscriber queue is full, events are dropped for that subscriber and a warning
-is logged.
+The protocol has no explicit end-to-end backpressure negotiation. The server
+buffers a bounded number of events per connection. When that buffer is full, a
+new ``snapshot`` or ``tick_update`` replaces the pending one of the same type, so
+a slow client skips straight to the latest world state. A pending snapshot that
+a queued source ``delta`` builds on is never replaced. Other events (``error_event``,
+``span_event``, source deltas) wait for room in the buffer instead.
+
+While they wait, sources using ``TickLoopSource`` keep fanning out events through
+bounded per-subscriber queues. When a subscriber queue is full, new events are
+dropped for that subscriber and a warning is logged.
 
 Limitations
 -----------
@@ -209,6 +223,14 @@ AnyServerEvent = (
     | MetadataMessage
 )
 
+
+class BatchMessage(BaseModel):
+    """Several streamed events delivered in one frame, in send order."""
+
+    type: Literal["batch"] = "batch"
+    events: list[Annotated[AnyServerEvent, Field(discriminator="type")]]
+
+
 # ---------------------------------------------------------------------------
 # WorldStateSource protocol
 # ---------------------------------------------------------------------------
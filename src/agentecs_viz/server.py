@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import OrderedDict, deque
 from contextlib import asynccontextmanager, suppress
 from typing import TYPE_CHECKING
 
@@ -11,8 +12,11 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from agentecs_viz._version import __version__
+from agentecs_viz.history import compute_delta
 from agentecs_viz.protocol import (
+    AnyServerEvent,
     ClientMessage,
+    DeltaMessage,
     ErrorMessage,
     GetSnapshotCommand,
     MetadataMessage,
@@ -26,11 +30,21 @@ from agentecs_viz.protocol import (
     TickUpdateMessage,
     WorldStateSource,
 )
+from agentecs_viz.snapshot import WorldSnapshot
 
 _client_message_adapter: TypeAdapter[ClientMessage] = TypeAdapter(ClientMessage)
 
+# Upper bound on streamed events coalesced into one frame.
+_MAX_BATCH_EVENTS = 128
+# Byte budget for encoded events kept for the other connections streaming them.
+_ENCODED_EVENT_CACHE_BYTES = 4 * 1024 * 1024
+# Encoded deltas kept for other connections holding the same base snapshot.
+_ENCODED_DELTA_CACHE_SIZE = 8
+# Streamed snapshots sent as deltas before the next full snapshot frame.
+_KEYFRAME_INTERVAL = 100
+
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +62,204 @@ class MetadataResponse(BaseModel):
     tick: int
 
 
+class _EventEncoder:
+    """Serializes each streamed event once, however many connections send it.
+
+    Every subscriber receives the same event objects, so while more than one
+    connection is streaming the JSON text is cached by identity, oldest first
+    out once ``max_bytes`` of text is held. Entries hold a reference to their
+    event so ids are not reused while cached. With a single connection nothing
+    is cached.
+    """
+
+    def __init__(self, max_bytes: int = _ENCODED_EVENT_CACHE_BYTES) -> None:
+        self._max_bytes = max_bytes
+        self._cached_bytes = 0
+        self._connections = 0
+        self._encoded: OrderedDict[int, tuple[AnyServerEvent, str]] = OrderedDict()
+        # Clients that are caught up share a base snapshot, so they share deltas too.
+        self._deltas: OrderedDict[tuple[int, int], tuple[WorldSnapshot, WorldSnapshot, str]] = (
+            OrderedDict()
+        )
+
+    def attach(self) -> None:
+        self._connections += 1
+
+    def detach(self) -> None:
+        self._connections -= 1
+        if self._connections <= 1:
+            self._encoded.clear()
+            self._deltas.clear()
+            self._cached_bytes = 0
+
+    def encode(self, event: AnyServerEvent) -> str:
+        if self._connections <= 1:
+            return event.model_dump_json()
+        key = id(event)
+        cached = self._encoded.get(key)
+        if cached is not None and cached[0] is event:
+            return cached[1]
+        text = event.model_dump_json()
+        self._encoded[key] = (event, text)
+        self._cached_bytes += len(text)
+        while self._cached_bytes > self._max_bytes and self._encoded:
+            _, (_, evicted) = self._encoded.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+        return text
+
+    def encode_delta(self, base: WorldSnapshot, snapshot: WorldSnapshot) -> str:
+        """Encode ``snapshot`` as a ``delta`` message against ``base``."""
+        if self._connections <= 1:
+            return self._delta_message(base, snapshot)
+        key = (id(base), id(snapshot))
+        cached = self._deltas.get(key)
+        if cached is not None and cached[0] is base and cached[1] is snapshot:
+            return cached[2]
+        text = self._delta_message(base, snapshot)
+        self._deltas[key] = (base, snapshot, text)
+        if len(self._deltas) > _ENCODED_DELTA_CACHE_SIZE:
+            self._deltas.popitem(last=False)
+        return text
+
+    @staticmethod
+    def _delta_message(base: WorldSnapshot, snapshot: WorldSnapshot) -> str:
+        delta = compute_delta(base, snapshot)
+        return DeltaMessage(tick=snapshot.tick, delta=delta).model_dump_json()
+
+
+class _EventBuffer:
+    """Bounded queue of streamed events for one connection, None ending the stream.
+
+    When full, a new snapshot or tick update replaces the pending one of the
+    same type instead of waiting, so a slow client skips to the latest world
+    state. A pending snapshot is only replaced while no source ``delta`` is
+    queued after it, since that delta applies on top of it. Anything else
+    waits for room: error and span events are history and are never dropped.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._events: deque[AnyServerEvent | None] = deque()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._events)
+
+    def empty(self) -> bool:
+        return not self._events
+
+    def full(self) -> bool:
+        return len(self._events) >= self._maxsize
+
+    async def put(self, event: AnyServerEvent | None) -> None:
+        while self.full():
+            if self._replace_pending(event):
+                return
+            self._writable.clear()
+            await self._writable.wait()
+        self._events.append(event)
+        self._readable.set()
+
+    async def get(self) -> AnyServerEvent | None:
+        while not self._events:
+            self._readable.clear()
+            await self._readable.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> AnyServerEvent | None:
+        event = self._events.popleft()
+        self._writable.set()
+        return event
+
+    def _replace_pending(self, event: AnyServerEvent | None) -> bool:
+        if not isinstance(event, (SnapshotMessage, TickUpdateMessage)):
+            return False
+        for i in range(len(self._events) - 1, -1, -1):
+            pending = self._events[i]
+            if isinstance(pending, DeltaMessage):
+                return False
+            if type(pending) is type(event):
+                # Requeue at the back so events stay in source order.
+                del self._events[i]
+                self._events.append(event)
+                return True
+        return False
+
+
+def _frame(parts: list[str]) -> str:
+    """Join encoded events into one frame: a single event as-is, several as a batch."""
+    if len(parts) == 1:
+        return parts[0]
+    # Same JSON as BatchMessage(events=...).model_dump_json(), from encoded parts.
+    return '{"type":"batch","events":[' + ",".join(parts) + "]}"
+
+
+class _ClientStream:
+    """Frames sent to one WebSocket client, tracking the world snapshot it holds.
+
+    Streamed snapshots go out as deltas against the last snapshot the client
+    received, with a full snapshot every ``_KEYFRAME_INTERVAL`` frames. Every
+    send takes one lock, so a delta is never overtaken by a seek reply that
+    replaced its base.
+    """
+
+    def __init__(self, websocket: WebSocket, encoder: _EventEncoder) -> None:
+        self._websocket = websocket
+        self._encoder = encoder
+        self._lock = asyncio.Lock()
+        self._base: WorldSnapshot | None = None
+        self._deltas_since_keyframe = 0
+
+    async def send(self, message: BaseModel) -> None:
+        """Send a one-off message; a full snapshot becomes the client's new base."""
+        async with self._lock:
+            if isinstance(message, SnapshotMessage):
+                self._base = message.snapshot
+                self._deltas_since_keyframe = 0
+            await self._websocket.send_text(message.model_dump_json())
+
+    async def send_events(self, batch: list[AnyServerEvent]) -> None:
+        """Send streamed events as one frame."""
+        async with self._lock:
+            await self._websocket.send_text(_frame([self._encode(event) for event in batch]))
+
+    def _encode(self, event: AnyServerEvent) -> str:
+        if not isinstance(event, SnapshotMessage):
+            if isinstance(event, DeltaMessage):
+                # A source delta moves the client past our base; the next
+                # snapshot must go out whole.
+                self._base = None
+            return self._encoder.encode(event)
+        base = self._base
+        self._base = event.snapshot
+        if base is not None and self._deltas_since_keyframe < _KEYFRAME_INTERVAL:
+            self._deltas_since_keyframe += 1
+            return self._encoder.encode_delta(base, event.snapshot)
+        self._deltas_since_keyframe = 0
+        return self._encoder.encode(event)
+
+
+async def _forward_events(
+    subscription: AsyncIterator[AnyServerEvent],
+    events: _EventBuffer,
+) -> None:
+    """Move subscription events into ``events``, then None once the subscription ends.
+
+    No end marker is queued when cancelled: the connection is being torn down,
+    nothing drains the queue any more, and waiting for room would never finish.
+    """
+    try:
+        async for event in subscription:
+            await events.put(event)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        await events.put(None)
+        raise
+    await events.put(None)
+
+
 def create_app(
     source: WorldStateSource,
     *,
@@ -66,6 +278,7 @@ def create_app(
 
     app = FastAPI(title=title, version=version, lifespan=lifespan)
     app.state.world_source = source
+    encoder = _EventEncoder()
 
     @app.get("/api/health", response_model=HealthResponse)
     async def health() -> HealthResponse:
@@ -90,18 +303,33 @@ def create_app(
         await websocket.accept()
         logger.info("WebSocket client connected")
 
+        stream = _ClientStream(websocket, encoder)
         bootstrap_complete = asyncio.Event()
+        events = _EventBuffer(_MAX_BATCH_EVENTS)
 
         async def send_events() -> None:
             try:
-                async for event in source.subscribe():
-                    await bootstrap_complete.wait()
-                    await websocket.send_text(event.model_dump_json())
+                await bootstrap_complete.wait()
+                while True:
+                    # Block for one event, then coalesce whatever else is ready.
+                    event = await events.get()
+                    batch: list[AnyServerEvent] = []
+                    while event is not None:
+                        batch.append(event)
+                        if len(batch) >= _MAX_BATCH_EVENTS or events.empty():
+                            break
+                        event = events.get_nowait()
+                    if batch:
+                        await stream.send_events(batch)
+                    if event is None:
+                        break
+                await forward_task
             except WebSocketDisconnect:
                 pass
             except Exception:
                 logger.warning("Event stream failed", exc_info=True)
 
+        forward_task = asyncio.create_task(_forward_events(source.subscribe(), events))
         send_task = asyncio.create_task(send_events())
 
         meta_msg = MetadataMessage(
@@ -111,32 +339,33 @@ def create_app(
             supports_history=source.supports_history,
             is_paused=source.is_paused,
         )
-        await websocket.send_text(meta_msg.model_dump_json())
+        await stream.send(meta_msg)
 
         snapshot = await source.get_snapshot()
         snapshot_msg = SnapshotMessage(
             tick=snapshot.tick,
             snapshot=snapshot,
         )
-        await websocket.send_text(snapshot_msg.model_dump_json())
+        await stream.send(snapshot_msg)
         bootstrap_complete.set()
 
         async def receive_commands() -> None:
             try:
                 while True:
-                    data = await websocket.receive_json()
+                    raw = await websocket.receive_text()
                     try:
-                        await _handle_command(source, websocket, data)
+                        await _handle_command(source, stream, raw)
                     except Exception as e:
                         logger.exception("WebSocket command failed")
                         err = ErrorMessage(tick=source.get_current_tick(), message=str(e))
-                        await websocket.send_text(err.model_dump_json())
+                        await stream.send(err)
             except WebSocketDisconnect:
                 pass
 
         receive_task = asyncio.create_task(receive_commands())
         tasks = {receive_task, send_task}
 
+        encoder.attach()
         try:
             done, _ = await asyncio.wait(
                 tasks,
@@ -153,12 +382,13 @@ def create_app(
         except Exception:
             logger.exception("WebSocket wait failed")
         finally:
-            pending_tasks = [task for task in tasks if not task.done()]
+            pending_tasks = [task for task in (*tasks, forward_task) if not task.done()]
             for task in pending_tasks:
                 task.cancel()
             for task in pending_tasks:
                 with suppress(asyncio.CancelledError):
                     await task
+            encoder.detach()
             logger.info("WebSocket client disconnected")
 
     return app
@@ -166,17 +396,19 @@ def create_app(
 
 async def _handle_command(
     source: WorldStateSource,
-    websocket: WebSocket,
-    data: object,
+    stream: _ClientStream,
+    raw: str | bytes,
 ) -> None:
+    # Parse and validate in a single pass; malformed JSON is reported like any
+    # other invalid command instead of dropping the connection.
     try:
-        cmd = _client_message_adapter.validate_python(data)
+        cmd = _client_message_adapter.validate_json(raw)
     except ValidationError as exc:
         err = ErrorMessage(
             tick=source.get_current_tick(),
             message=f"Invalid command: {exc.errors()[0]['msg']}",
         )
-        await websocket.send_text(err.model_dump_json())
+        await stream.send(err)
         return
 
     match cmd:
@@ -187,11 +419,11 @@ async def _handle_command(
                 tick=snapshot.tick,
                 snapshot=snapshot,
             )
-            await websocket.send_text(snapshot_response.model_dump_json())
+            await stream.send(snapshot_response)
         case SeekCommand(tick=tick):
             snapshot = await source.get_snapshot(tick)
             snapshot_message = SnapshotMessage(tick=snapshot.tick, snapshot=snapshot)
-            await websocket.send_text(snapshot_message.model_dump_json())
+            await stream.send(snapshot_message)
         case PauseCommand() | ResumeCommand() | StepCommand():
             await source.send_command(cmd.command)
             snapshot = await source.get_snapshot()
@@ -200,7 +432,7 @@ async def _handle_command(
                 entity_count=snapshot.entity_count,
                 is_paused=source.is_paused,
             )
-            await websocket.send_text(ack.model_dump_json())
+            await stream.send(ack)
         case SetSpeedCommand(ticks_per_second=tps):
             await source.send_command("set_speed", ticks_per_second=tps)
         case _:
@@ -1,31 +1,65 @@
-"""Snapshot models for world state serialization."""
+"""Snapshot models for world state serialization.
+
+Models are frozen: history shares entities and components across ticks, so
+fields are read-only once built. Nested ``data`` dicts are not deep-frozen and
+must be treated as read-only too.
+"""
 
 from __future__ import annotations
 
-from typing import Any
+import sys
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Annotated, Any, Self
+
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, computed_field
 
-from pydantic import BaseModel, Field, computed_field
+# Component type names repeat across every entity and tick; interning them lets
+# dict lookups keyed by type compare by identity and keeps one copy per name.
+_TypeName = Annotated[str, AfterValidator(sys.intern)]
 
 
 class ComponentSnapshot(BaseModel):
-    type_name: str = Field(description="Fully qualified component type name")
-    type_short: str = Field(description="Short type name for display")
+    model_config = ConfigDict(frozen=True)
+
+    type_name: _TypeName = Field(description="Fully qualified component type name")
+    type_short: _TypeName = Field(description="Short type name for display")
     data: dict[str, Any] = Field(default_factory=dict, description="Component data")
 
 
 class EntitySnapshot(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int = Field(description="Entity ID")
     components: list[ComponentSnapshot] = Field(
         default_factory=list, description="Component snapshots"
     )
 
+    # Cached: unchanged entities are shared across ticks and serialized every tick.
     @computed_field  # type: ignore[prop-decorator]
-    @property
+    @cached_property
     def archetype(self) -> tuple[str, ...]:
         return tuple(sorted(c.type_short for c in self.components))
 
+    @cached_property
+    def _components_by_type(self) -> dict[str, ComponentSnapshot]:
+        return {c.type_short: c for c in self.components}
+
+    def by_type(self) -> dict[str, ComponentSnapshot]:
+        """Components keyed by ``type_short``, built once on first use."""
+        return self._components_by_type
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        copied = super().model_copy(update=update, deep=deep)
+        # The copied __dict__ carries values derived from the original components.
+        copied.__dict__.pop("_components_by_type", None)
+        copied.__dict__.pop("archetype", None)
+        return copied
+
 
 class WorldSnapshot(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     tick: int = Field(default=0, description="Current tick number")
     timestamp: float = Field(default=0.0, description="Timestamp of the snapshot")
     entities: list[EntitySnapshot] = Field(default_factory=list, description="All entity snapshots")
@@ -41,15 +75,37 @@ class WorldSnapshot(BaseModel):
     def archetypes(self) -> list[tuple[str, ...]]:
         return sorted({e.archetype for e in self.entities})
 
+    @cached_property
+    def _entities_by_id(self) -> dict[int, EntitySnapshot]:
+        return {e.id: e for e in self.entities}
+
+    def by_id(self) -> dict[int, EntitySnapshot]:
+        """Entities keyed by id, built once on first use.
+
+        The index is cached, so ``entities`` must not be resized in place after
+        the first call. ``model_copy`` rebuilds it for the copy.
+        """
+        return self._entities_by_id
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        copied = super().model_copy(update=update, deep=deep)
+        # The copied __dict__ carries the index of the original entities.
+        copied.__dict__.pop("_entities_by_id", None)
+        return copied
+
 
 class ComponentDiff(BaseModel):
-    component_type: str = Field(description="Short component type name")
-    type_name: str = Field(description="Fully qualified component type name")
+    model_config = ConfigDict(frozen=True)
+
+    component_type: _TypeName = Field(description="Short component type name")
+    type_name: _TypeName = Field(description="Fully qualified component type name")
     old_value: dict[str, Any] | None = Field(default=None, description="Previous value")
     new_value: dict[str, Any] | None = Field(default=None, description="Current value")
 
 
 class TickDelta(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     tick: int = Field(description="Tick number this delta describes")
     timestamp: float = Field(default=0.0, description="Timestamp of the tick")
     spawned: list[EntitySnapshot] = Field(
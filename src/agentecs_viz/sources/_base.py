@@ -39,7 +39,8 @@ class TickLoopSource:
         self._connected = False
         self._paused = False
         self._stop_event: asyncio.Event | None = None
-        self._subscribers: set[asyncio.Queue[AnyServerEvent]] = set()
+        # None in a subscriber queue marks the end of the stream.
+        self._subscribers: set[asyncio.Queue[AnyServerEvent | None]] = set()
         self._loop_task: asyncio.Task[None] | None = None
 
     @property
@@ -73,6 +74,13 @@ class TickLoopSource:
         self._connected = False
         if self._stop_event:
             self._stop_event.set()
+        for queue in self._subscribers:
+            if queue.full():
+                # Evict the oldest pending event to make room for the wake-up marker.
+                # A subscriber delivers at most the event it is resuming with, then
+                # stops at its stop-event check, leaving the rest of the backlog.
+                queue.get_nowait()
+            queue.put_nowait(None)
         if self._loop_task:
             self._loop_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
@@ -86,7 +94,7 @@ class TickLoopSource:
             return
             yield  # pragma: no cover - makes this a proper empty async generator
 
-        queue: asyncio.Queue[AnyServerEvent] = asyncio.Queue(
+        queue: asyncio.Queue[AnyServerEvent | None] = asyncio.Queue(
             maxsize=self._event_queue_maxsize,
         )
         self._subscribers.add(queue)
@@ -94,29 +102,34 @@ class TickLoopSource:
             async for event in self._emit_initial_events():
                 yield event
 
+            # disconnect() wakes subscribers registered before it; later ones stop here.
             while not stop_event.is_set():
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=0.1)
-                    yield event
-                except TimeoutError:
-                    continue
+                next_event = await queue.get()
+                if next_event is None:
+                    break
+                yield next_event
+                if not queue.empty():
+                    # get() does not suspend while events are pending; let other tasks run.
+                    await asyncio.sleep(0)
         finally:
             self._subscribers.discard(queue)
 
     async def _run_loop(self) -> None:
-        while self._connected and self._stop_event and not self._stop_event.is_set():
-            await self._tick_loop_body()
-            try:
-                await asyncio.wait_for(
-                    self._stop_event.wait(),
-                    timeout=self._get_loop_interval(),
-                )
-                break
-            except TimeoutError:
-                continue
+        stop_event = self._stop_event
+        if not stop_event:
+            return
+        # One stop waiter for the loop's lifetime; asyncio.wait times out without raising.
+        stopped = asyncio.ensure_future(stop_event.wait())
+        try:
+            while self._connected and not stop_event.is_set():
+                await self._tick_loop_body()
+                await asyncio.wait({stopped}, timeout=self._get_loop_interval())
+        finally:
+            stopped.cancel()
 
     async def _emit_event(self, event: AnyServerEvent) -> None:
-        for queue in list(self._subscribers):
+        # No await in the loop: subscribe() cannot add or discard a queue mid-iteration.
+        for queue in self._subscribers:
             try:
                 queue.put_nowait(event)
             except asyncio.QueueFull:
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import random
+import secrets
+import sys
 import time
-import uuid
+from collections.abc import Callable
+from functools import cache
 from typing import Any, NamedTuple
 
 from agentecs_viz.config import ArchetypeConfig, VisualizationConfig
@@ -28,6 +31,8 @@ ERROR_PROBABILITY = 0.10
 LOOP_CANDIDATE_PROBABILITY = 0.20
 LOOP_FREEZE_MIN_TICKS = 5
 LOOP_FREEZE_MAX_TICKS = 15
+# Components _update_entities never replaces; equal ones are shared between entities.
+INTERNED_COMPONENT_TYPES = frozenset({"Agent", "Priority", "Memory", "Goals"})
 SYSTEM_NAMES = [
     "MovementSystem",
     "TaskScheduler",
@@ -118,6 +123,39 @@ ERROR_TEMPLATES: list[tuple[str, ErrorSeverity]] = [
 ]
 
 
+_COMPONENT_GENERATORS: dict[str, Callable[[random.Random], dict[str, Any]]] = {
+    "Position": lambda rng: {
+        "x": rng.uniform(-100, 100),
+        "y": rng.uniform(-100, 100),
+    },
+    "Velocity": lambda rng: {
+        "dx": rng.uniform(-5, 5),
+        "dy": rng.uniform(-5, 5),
+    },
+    "Agent": lambda rng: {
+        "name": f"Agent_{rng.randint(1, 100)}",
+        "state": rng.choice(["idle", "working", "waiting"]),
+    },
+    "Task": lambda rng: {
+        "description": f"Task {rng.randint(1, 1000)}",
+        "status": rng.choice(["pending", "in_progress", "completed"]),
+    },
+    "Priority": lambda rng: {"level": rng.randint(1, 5)},
+    "Deadline": lambda rng: {"remaining_ticks": rng.randint(1, 100)},
+    "Memory": lambda rng: {"entries": rng.randint(0, 50)},
+    "Goals": lambda rng: {"count": rng.randint(1, 5)},
+}
+
+
+def _default_component_data(rng: random.Random) -> dict[str, Any]:
+    return {"value": rng.random()}
+
+
+@cache
+def _qualified_type_name(type_name: str) -> str:
+    return sys.intern(f"mock.components.{type_name}")
+
+
 def _default_archetypes() -> list[tuple[str, ...]]:
     return [
         ("Agent", "Position"),
@@ -193,7 +231,13 @@ class MockWorldSource(TickLoopSource):
         self._tick = 0
         self._next_entity_id = 0
         self._entities: list[EntitySnapshot] = []
+        # Ids of entities with an Agent component (values unused), in entity order;
+        # archetypes never change.
+        self._agent_ids: dict[int, None] = {}
         self._entity_freeze_tick: dict[int, int] = {}
+        # Snapshot of the current tick, shared by get_snapshot() until the world changes.
+        self._current_snapshot: WorldSnapshot | None = None
+        self._component_pool: dict[tuple[str, tuple[tuple[str, Any], ...]], ComponentSnapshot] = {}
         self._history = InMemoryHistoryStore(
             max_ticks=max_history_ticks,
             checkpoint_interval=100,
@@ -218,10 +262,11 @@ class MockWorldSource(TickLoopSource):
         self._rng = random.Random(self._seed)
         self._history.clear()
         self._entities = self._generate_entities()
+        self._agent_ids = dict.fromkeys(e.id for e in self._entities if "Agent" in e.by_type())
         self._entity_freeze_tick = {}
         for entity in self._entities:
             self._maybe_schedule_entity_freeze(entity)
-        snapshot = self._build_snapshot()
+        snapshot = self._current_snapshot = self._build_snapshot()
         self._history.record_tick(snapshot)
 
     async def get_snapshot(self, tick: int | None = None) -> WorldSnapshot:
@@ -229,7 +274,10 @@ class MockWorldSource(TickLoopSource):
             historical = self._history.get_snapshot(tick)
             if historical is not None:
                 return historical
-        return self._build_snapshot()
+        current = self._current_snapshot
+        if current is None or current.metadata["paused"] != self._paused:
+            current = self._current_snapshot = self._build_snapshot()
+        return current
 
     def get_current_tick(self) -> int:
         return self._tick
@@ -254,7 +302,7 @@ class MockWorldSource(TickLoopSource):
     async def _execute_tick(self) -> None:
         self._tick += 1
         self._update_entities()
-        snapshot = self._build_snapshot()
+        snapshot = self._current_snapshot = self._build_snapshot()
         self._history.record_tick(snapshot)
         await self._emit_event(SnapshotMessage(tick=self._tick, snapshot=snapshot))
 
@@ -301,39 +349,25 @@ class MockWorldSource(TickLoopSource):
         self._entity_freeze_tick[entity.id] = self._tick + freeze_delay
 
     def _generate_component(self, type_name: str) -> ComponentSnapshot:
+        data = self._mock_component_data(type_name)
+        if type_name not in INTERNED_COMPONENT_TYPES:
+            return self._new_component(type_name, data)
+        key = (type_name, tuple(sorted(data.items())))
+        component = self._component_pool.get(key)
+        if component is None:
+            component = self._component_pool[key] = self._new_component(type_name, data)
+        return component
+
+    @staticmethod
+    def _new_component(type_name: str, data: dict[str, Any]) -> ComponentSnapshot:
         return ComponentSnapshot(
-            type_name=f"mock.components.{type_name}",
+            type_name=_qualified_type_name(type_name),
             type_short=type_name,
-            data=self._mock_component_data(type_name),
+            data=data,
         )
 
     def _mock_component_data(self, type_name: str) -> dict[str, Any]:
-        generators: dict[str, Any] = {
-            "Position": lambda: {
-                "x": self._rng.uniform(-100, 100),
-                "y": self._rng.uniform(-100, 100),
-            },
-            "Velocity": lambda: {
-                "dx": self._rng.uniform(-5, 5),
-                "dy": self._rng.uniform(-5, 5),
-            },
-            "Agent": lambda: {
-                "name": f"Agent_{self._rng.randint(1, 100)}",
-                "state": self._rng.choice(["idle", "working", "waiting"]),
-            },
-            "Task": lambda: {
-                "description": f"Task {self._rng.randint(1, 1000)}",
-                "status": self._rng.choice(["pending", "in_progress", "completed"]),
-            },
-            "Priority": lambda: {"level": self._rng.randint(1, 5)},
-            "Deadline": lambda: {"remaining_ticks": self._rng.randint(1, 100)},
-            "Memory": lambda: {"entries": self._rng.randint(0, 50)},
-            "Goals": lambda: {"count": self._rng.randint(1, 5)},
-        }
-        gen = generators.get(type_name)
-        if gen:
-            return gen()  # type: ignore[no-any-return]
-        return {"value": self._rng.random()}
+        return _COMPONENT_GENERATORS.get(type_name, _default_component_data)(self._rng)
 
     async def _generate_spans(self) -> None:
         """Generate spans for all systems in execution group order.
@@ -341,11 +375,9 @@ class MockWorldSource(TickLoopSource):
         Systems within the same group run in parallel (overlapping start times).
         Groups execute sequentially.
         """
-        agent_entities = [
-            e for e in self._entities if any(c.type_short == "Agent" for c in e.components)
-        ]
-        if not agent_entities:
+        if not self._agent_ids:
             return
+        agent_ids = list(self._agent_ids)
 
         now = time.time()
         cursor = now
@@ -356,9 +388,9 @@ class MockWorldSource(TickLoopSource):
             group_end = group_start
 
             for system_name in group:
-                entity = self._rng.choice(agent_entities)
-                trace_id = uuid.uuid4().hex
-                root_span_id = uuid.uuid4().hex
+                entity_id = self._rng.choice(agent_ids)
+                trace_id = secrets.token_hex(16)
+                root_span_id = secrets.token_hex(16)
                 # Parallel systems start at roughly the same time
                 sys_start = group_start + self._rng.uniform(0, 0.005)
 
@@ -371,7 +403,7 @@ class MockWorldSource(TickLoopSource):
                             children,
                             trace_id,
                             root_span_id,
-                            entity.id,
+                            entity_id,
                             child_cursor,
                             self._rng.randint(1, 3),
                             depth=0,
@@ -381,7 +413,7 @@ class MockWorldSource(TickLoopSource):
                             children,
                             trace_id,
                             root_span_id,
-                            entity.id,
+                            entity_id,
                             child_cursor,
                             self._rng.randint(3, 5),
                             depth=0,
@@ -391,7 +423,7 @@ class MockWorldSource(TickLoopSource):
                             children,
                             trace_id,
                             root_span_id,
-                            entity.id,
+                            entity_id,
                             child_cursor,
                         )
                     sys_duration = child_cursor - sys_start
@@ -410,7 +442,7 @@ class MockWorldSource(TickLoopSource):
                     status=SpanStatus.error if has_error else SpanStatus.ok,
                     attributes={
                         "agentecs.tick": self._tick,
-                        "agentecs.entity_id": entity.id,
+                        "agentecs.entity_id": entity_id,
                         "agentecs.system": system_name,
                     },
                 )
@@ -433,7 +465,7 @@ class MockWorldSource(TickLoopSource):
     ) -> SpanEventMessage:
         profile = self._rng.choice(LLM_PROFILES)
         return SpanEventMessage(
-            span_id=uuid.uuid4().hex,
+            span_id=secrets.token_hex(16),
             trace_id=trace_id,
             parent_span_id=parent_id,
             name=f"llm.{profile.model}",
@@ -463,7 +495,7 @@ class MockWorldSource(TickLoopSource):
     ) -> SpanEventMessage:
         tool_name, tool_input, tool_output = self._rng.choice(TOOL_TEMPLATES)
         return SpanEventMessage(
-            span_id=uuid.uuid4().hex,
+            span_id=secrets.token_hex(16),
             trace_id=trace_id,
             parent_span_id=parent_id,
             name=f"tool.{tool_name}",
@@ -549,36 +581,67 @@ class MockWorldSource(TickLoopSource):
         return cursor
 
     def _update_entities(self) -> None:
-        for entity in self._entities:
-            comp_by_type = {c.type_short: c for c in entity.components}
+        # Entities are shared with emitted and recorded snapshots, so changed
+        # components are replaced rather than mutated in place.
+        for idx, entity in enumerate(self._entities):
+            comp_by_type = entity.by_type()
+            updates: dict[str, dict[str, Any]] = {}
             vel = comp_by_type.get("Velocity")
+            vel_data = vel.data if vel else None
 
             freeze_tick = self._entity_freeze_tick.get(entity.id)
-            if freeze_tick is not None and self._tick >= freeze_tick and vel:
-                vel.data["dx"] = 0.0
-                vel.data["dy"] = 0.0
-
-            if "Position" in comp_by_type:
-                pos = comp_by_type["Position"]
-                if vel:
-                    pos.data["x"] += vel.data.get("dx", 0)
-                    pos.data["y"] += vel.data.get("dy", 0)
-
-            if "Deadline" in comp_by_type:
-                deadline = comp_by_type["Deadline"]
-                remaining = deadline.data.get("remaining_ticks", 0)
-                deadline.data["remaining_ticks"] = max(0, remaining - 1)
-
-            if "Task" in comp_by_type:
-                task = comp_by_type["Task"]
-                if self._rng.random() < TASK_COMPLETION_PROBABILITY:
-                    task.data["status"] = "completed"
+            if freeze_tick is not None and self._tick >= freeze_tick and vel_data is not None:
+                frozen = {**vel_data, "dx": 0.0, "dy": 0.0}
+                if frozen != vel_data:
+                    updates["Velocity"] = vel_data = frozen
+
+            pos = comp_by_type.get("Position")
+            if pos is not None and vel_data is not None:
+                dx = vel_data.get("dx", 0)
+                dy = vel_data.get("dy", 0)
+                if dx or dy:
+                    updates["Position"] = {
+                        **pos.data,
+                        "x": pos.data["x"] + dx,
+                        "y": pos.data["y"] + dy,
+                    }
+
+            deadline = comp_by_type.get("Deadline")
+            if deadline is not None:
+                remaining = max(0, deadline.data.get("remaining_ticks", 0) - 1)
+                if deadline.data.get("remaining_ticks") != remaining:
+                    updates["Deadline"] = {**deadline.data, "remaining_ticks": remaining}
+
+            task = comp_by_type.get("Task")
+            if (
+                task is not None
+                and self._rng.random() < TASK_COMPLETION_PROBABILITY
+                and task.data.get("status") != "completed"
+            ):
+                updates["Task"] = {**task.data, "status": "completed"}
+
+            if updates:
+                self._entities[idx] = EntitySnapshot(
+                    id=entity.id,
+                    components=[
+                        ComponentSnapshot(
+                            type_name=c.type_name,
+                            type_short=c.type_short,
+                            data=updates[c.type_short],
+                        )
+                        if c.type_short in updates
+                        else c
+                        for c in entity.components
+                    ],
+                )
 
         max_entities = self._entity_count * MAX_ENTITY_MULTIPLIER
         if self._rng.random() < ENTITY_SPAWN_PROBABILITY and len(self._entities) < max_entities:
             new_id = self._next_entity_id
             self._next_entity_id += 1
             archetype_template = self._rng.choice(self._archetypes)
+            if "Agent" in archetype_template:
+                self._agent_ids[new_id] = None
             self._entities.append(
                 EntitySnapshot(
                     id=new_id,
@@ -593,3 +656,4 @@ class MockWorldSource(TickLoopSource):
         ):
             removed_entity = self._entities.pop(self._rng.randrange(len(self._entities)))
             self._entity_freeze_tick.pop(removed_entity.id, None)
+            self._agent_ids.pop(removed_entity.id, None)
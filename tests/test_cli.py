@@ -140,6 +140,14 @@ class TestCmdServe:
         assert result == 0
         run.assert_called_once()
 
+    def test_cmd_serve_enables_websocket_compression(self):
+        args = create_parser().parse_args(["serve", "--mock", "--no-frontend"])
+
+        with patch("uvicorn.run") as run:
+            cmd_serve(args)
+
+        assert run.call_args.kwargs["ws_per_message_deflate"] is True
+
     def test_cmd_serve_world_module(self):
         args = create_parser().parse_args(["serve", "--world-module", "my.world", "--no-frontend"])
         source = MockWorldSource(entity_count=1)
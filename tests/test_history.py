@@ -1,14 +1,25 @@
+import math
+
 from helpers import make_entity, make_snapshot
 
 from agentecs_viz.history import (
     InMemoryHistoryStore,
     _apply_delta,
-    _compute_delta,
     _diff_entity,
+    compute_delta,
     compute_entity_lifecycles,
 )
 from agentecs_viz.protocol import ErrorEventMessage, ErrorSeverity, SpanEventMessage, SpanStatus
-from agentecs_viz.snapshot import ComponentDiff, TickDelta
+from agentecs_viz.snapshot import ComponentDiff, ComponentSnapshot, EntitySnapshot, TickDelta
+
+
+class _UncomparableData(dict):
+    """Component payload that fails the test if it is ever compared by value."""
+
+    def __eq__(self, other):
+        raise AssertionError("shared payload was compared by value")
+
+    __ne__ = __eq__
 
 
 class TestDiffEntity:
@@ -42,35 +53,95 @@ class TestDiffEntity:
         assert diffs[0].component_type == "Health"
         assert diffs[0].new_value is None
 
+    def test_added_removed_and_modified_together(self):
+        old = make_entity(1, Position={"x": 0}, Health={"hp": 100})
+        new = make_entity(1, Position={"x": 1}, Velocity={"dx": 2})
+        diffs = {d.component_type: d for d in _diff_entity(old, new)}
+        assert set(diffs) == {"Position", "Health", "Velocity"}
+        assert diffs["Position"].new_value == {"x": 1}
+        assert diffs["Health"].new_value is None
+        assert diffs["Velocity"].old_value is None
+
+    def test_same_types_in_different_order(self):
+        old = make_entity(1, Position={"x": 0}, Health={"hp": 100})
+        new = make_entity(1, Health={"hp": 90}, Position={"x": 0})
+        diffs = _diff_entity(old, new)
+        assert len(diffs) == 1
+        assert diffs[0].component_type == "Health"
+        assert diffs[0].new_value == {"hp": 90}
+
+    def test_reordered_components_sharing_data_skip_comparison(self):
+        shared = _UncomparableData(hp=100)
+        pos = ComponentSnapshot(type_name="m.Position", type_short="Position", data={"x": 0})
+        health = ComponentSnapshot.model_construct(
+            type_name="m.Health", type_short="Health", data=shared
+        )
+        moved = ComponentSnapshot.model_construct(
+            type_name="m.Health", type_short="Health", data=shared
+        )
+        old = EntitySnapshot(id=1, components=[pos, health])
+        new = EntitySnapshot(id=1, components=[moved, pos])
+        assert _diff_entity(old, new) == []
+
+    def test_swapped_component_with_same_count(self):
+        old = make_entity(1, Position={"x": 0}, Health={"hp": 100})
+        new = make_entity(1, Position={"x": 0}, Velocity={"dx": 1})
+        diffs = {d.component_type: d for d in _diff_entity(old, new)}
+        assert set(diffs) == {"Health", "Velocity"}
+        assert diffs["Health"].new_value is None
+        assert diffs["Velocity"].old_value is None
+
 
 class TestComputeDelta:
     def test_spawned(self):
         old = make_snapshot(0, [make_entity(1, A={})])
         new = make_snapshot(1, [make_entity(1, A={}), make_entity(2, B={})])
-        delta = _compute_delta(old, new)
+        delta = compute_delta(old, new)
         assert len(delta.spawned) == 1
         assert delta.spawned[0].id == 2
 
     def test_destroyed(self):
         old = make_snapshot(0, [make_entity(1, A={}), make_entity(2, B={})])
         new = make_snapshot(1, [make_entity(1, A={})])
-        delta = _compute_delta(old, new)
+        delta = compute_delta(old, new)
         assert delta.destroyed == [2]
 
     def test_modified(self):
         old = make_snapshot(0, [make_entity(1, Position={"x": 0})])
         new = make_snapshot(1, [make_entity(1, Position={"x": 5})])
-        delta = _compute_delta(old, new)
+        delta = compute_delta(old, new)
         assert 1 in delta.modified
         assert delta.modified[1][0].new_value == {"x": 5}
 
     def test_no_changes(self):
         snap = make_snapshot(0, [make_entity(1, A={"v": 1})])
-        delta = _compute_delta(snap, snap)
+        delta = compute_delta(snap, snap)
         assert delta.spawned == []
         assert delta.destroyed == []
         assert delta.modified == {}
 
+    def test_shared_entities_with_one_change(self):
+        shared = make_entity(1, A={"v": 1})
+        old = make_snapshot(0, [shared, make_entity(2, B={"v": 1})])
+        new = make_snapshot(1, [shared, make_entity(2, B={"v": 2})])
+        delta = compute_delta(old, new)
+        assert list(delta.modified) == [2]
+
+    def test_shared_entity_list_gives_empty_delta(self):
+        old = make_snapshot(0, [make_entity(1, A={"v": 1})])
+        new = old.model_copy(update={"tick": 1})
+        delta = compute_delta(old, new)
+        assert delta.tick == 1
+        assert (delta.spawned, delta.destroyed, delta.modified) == ([], [], {})
+
+    def test_same_population_reordered(self):
+        old = make_snapshot(0, [make_entity(1, A={"v": 1}), make_entity(2, A={"v": 1})])
+        new = make_snapshot(1, [make_entity(2, A={"v": 2}), make_entity(1, A={"v": 1})])
+        delta = compute_delta(old, new)
+        assert delta.spawned == []
+        assert delta.destroyed == []
+        assert list(delta.modified) == [2]
+
 
 class TestApplyDelta:
     def test_apply_spawn(self):
@@ -106,12 +177,27 @@ class TestApplyDelta:
     def test_roundtrip(self):
         old = make_snapshot(0, [make_entity(1, X={"a": 1}), make_entity(2, Y={"b": 2})])
         new = make_snapshot(1, [make_entity(1, X={"a": 10}), make_entity(3, Z={"c": 3})])
-        delta = _compute_delta(old, new)
+        delta = compute_delta(old, new)
         reconstructed = _apply_delta(old, delta)
         assert reconstructed.tick == 1
         ids = {e.id for e in reconstructed.entities}
         assert ids == {1, 3}
 
+    def test_apply_does_not_mutate_base_snapshot(self):
+        snap = make_snapshot(0, [make_entity(1, Position={"x": 0}), make_entity(2, B={"y": 1})])
+        diff = ComponentDiff(
+            component_type="Position",
+            type_name="m.Position",
+            old_value={"x": 0},
+            new_value={"x": 5},
+        )
+
+        td = TickDelta(tick=1, timestamp=1.0, modified={1: [diff]})
+        result = _apply_delta(snap, td)
+        assert snap.entities[0].components[0].data == {"x": 0}
+        assert result.entities[0].components[0].data == {"x": 5}
+        assert result.entities[1] is snap.entities[1]
+
     def test_apply_modify_missing_entity_is_ignored(self):
         snap = make_snapshot(0, [make_entity(1, Position={"x": 0})])
         diff = ComponentDiff(
@@ -152,20 +238,20 @@ class TestApplyDelta:
         """_apply_delta reconstructs components with correct type_name, not 'unknown.X'."""
         old = make_snapshot(0, [make_entity(1, Position={"x": 0})])
         new = make_snapshot(1, [make_entity(1, Position={"x": 5})])
-        delta = _compute_delta(old, new)
+        delta = compute_delta(old, new)
         result = _apply_delta(old, delta)
         comp = result.entities[0].components[0]
         assert comp.type_name == "m.Position"
         assert comp.type_short == "Position"
 
     def test_type_name_preserved_after_eviction(self):
-        """After checkpoint eviction + delta promotion, type_name is still correct."""
+        """After checkpoint eviction, type_name is still correct for leading deltas."""
         store = InMemoryHistoryStore(max_ticks=3, checkpoint_interval=5)
         # Tick 0 = checkpoint, tick 1 = delta (component added), tick 2 = delta
         store.record_tick(make_snapshot(0, [make_entity(1, A={"v": 0})]))
         store.record_tick(make_snapshot(1, [make_entity(1, A={"v": 1}, B={"w": 10})]))
         store.record_tick(make_snapshot(2, [make_entity(1, A={"v": 2}, B={"w": 20})]))
-        # Tick 3 evicts tick 0, promoting tick 1 (delta->checkpoint via _apply_delta)
+        # Tick 3 evicts tick 0; tick 1 is replayed from the evicted checkpoint
         store.record_tick(make_snapshot(3, [make_entity(1, A={"v": 3}, B={"w": 30})]))
 
         result = store.get_snapshot(1)
@@ -206,6 +292,33 @@ class TestInMemoryHistoryStore:
             pos_data = {c.type_short: c.data for c in result.entities[0].components}
             assert pos_data["Position"]["x"] == i * 10
 
+    def test_returned_snapshot_nested_data_is_isolated(self):
+        store = InMemoryHistoryStore(max_ticks=100, checkpoint_interval=10)
+        store.record_tick(make_snapshot(0, [make_entity(1, Memory={"entries": [{"k": 1}]})]))
+
+        result = store.get_snapshot(0)
+        assert result is not None
+        assert result.entities[0].components[0].data == {"entries": [{"k": 1}]}
+        result.entities[0].components[0].data["entries"].append({"k": 3})
+
+        again = store.get_snapshot(0)
+        assert again is not None
+        assert again.entities[0].components[0].data == {"entries": [{"k": 1}]}
+
+    def test_repeated_reconstruction_uses_cache_safely(self):
+        store = InMemoryHistoryStore(max_ticks=100, checkpoint_interval=10)
+        for i in range(10):
+            store.record_tick(make_snapshot(i, [make_entity(1, Position={"x": i})]))
+
+        first = store.get_snapshot(7)
+        assert first is not None
+        first.entities[0].components[0].data["x"] = -1
+
+        for i in (7, 9, 3, 8):
+            result = store.get_snapshot(i)
+            assert result is not None
+            assert result.entities[0].components[0].data == {"x": i}
+
     def test_eviction(self):
         store = InMemoryHistoryStore(max_ticks=5, checkpoint_interval=3)
         for i in range(10):
@@ -215,19 +328,101 @@ class TestInMemoryHistoryStore:
         assert store.get_snapshot(0) is None
         assert store.get_snapshot(5) is not None
 
+    def test_reconstruction_after_wraparound(self):
+        store = InMemoryHistoryStore(max_ticks=5, checkpoint_interval=4)
+        for i in range(13):
+            store.record_tick(make_snapshot(i, [make_entity(1, A={"v": i})]))
+
+        assert store.stored_ticks == (8, 9, 10, 11, 12)
+        for i in range(8, 13):
+            result = store.get_snapshot(i)
+            assert result is not None
+            assert result.entities[0].components[0].data == {"v": i}
+
+    def test_adaptive_checkpoint_on_heavy_deltas(self):
+        store = InMemoryHistoryStore(
+            checkpoint_interval=100, adaptive_checkpoint_ratio=0.5, min_checkpoint_interval=2
+        )
+        for i in range(7):
+            entities = [make_entity(e, A={"v": i if e < 3 else 0}) for e in range(4)]
+            store.record_tick(make_snapshot(i, entities))
+
+        # 3 of 4 entities change per tick: the second delta after a checkpoint crosses 0.5
+        assert list(store._checkpoint_ticks) == [0, 2, 4, 6]
+        for i in range(7):
+            result = store.get_snapshot(i)
+            assert result is not None
+            assert result.entities[0].components[0].data == {"v": i}
+
+    def test_cold_checkpoints_are_compressed(self):
+        store = InMemoryHistoryStore(max_ticks=8, checkpoint_interval=2, hot_checkpoints=1)
+        for i in range(10):
+            store.record_tick(make_snapshot(i, [make_entity(1, A={"v": i, "n": [i]})]))
+
+        cold = [store._ring[store._tick_to_slot[t]].payload for t in store._checkpoint_ticks]
+        assert [isinstance(p, bytes) for p in cold] == [True, True, True, False]
+        for i in range(2, 10):
+            result = store.get_snapshot(i)
+            assert result is not None
+            assert result.entities[0].components[0].data == {"v": i, "n": [i]}
+
+    def test_cold_checkpoints_round_trip_exactly(self):
+        store = InMemoryHistoryStore(max_ticks=8, checkpoint_interval=2, hot_checkpoints=1)
+        odd = {"v": math.nan, "w": math.inf, "t": (1, 2), "n": {3: "k"}}
+        store.record_tick(make_snapshot(0, [make_entity(1, A=odd)]))
+        for i in range(1, 6):
+            store.record_tick(make_snapshot(i, [make_entity(1, A=odd, B={"v": i})]))
+
+        assert isinstance(store._ring[store._tick_to_slot[0]].payload, bytes)
+        for tick in (0, 1):
+            result = store.get_snapshot(tick)
+            assert result is not None
+            data = result.entities[0].components[0].data
+            assert math.isnan(data["v"])
+            assert data["w"] == math.inf
+            assert type(data["t"]) is tuple and data["t"] == (1, 2)
+            assert data["n"] == {3: "k"}
+
+    def test_adaptive_checkpoint_disabled_by_default(self):
+        store = InMemoryHistoryStore(checkpoint_interval=100)
+        for i in range(5):
+            store.record_tick(make_snapshot(i, [make_entity(1, A={"v": i})]))
+        assert list(store._checkpoint_ticks) == [0]
+
     def test_eviction_promotes_checkpoint(self):
         store = InMemoryHistoryStore(max_ticks=3, checkpoint_interval=5)
         # Tick 0 is checkpoint, ticks 1,2 are deltas
         for i in range(4):
             store.record_tick(make_snapshot(i, [make_entity(1, A={"v": i})]))
 
-        # After evicting tick 0, tick 1 should become a checkpoint
+        # After evicting tick 0, tick 1 is still reconstructible
         assert store.get_snapshot(1) is not None
         result = store.get_snapshot(1)
         assert result is not None
         data = {c.type_short: c.data for c in result.entities[0].components}
         assert data["A"]["v"] == 1
 
+    def test_eviction_defers_promotion_until_read(self):
+        store = InMemoryHistoryStore(max_ticks=4, checkpoint_interval=5)
+        for i in range(7):
+            store.record_tick(make_snapshot(i, [make_entity(1, A={"v": i})]))
+
+        # Ticks 0-2 were evicted without replaying anything; tick 5 is the next checkpoint
+        assert list(store._checkpoint_ticks) == [5]
+        assert store._front_base is not None
+        assert [d.tick for d in store._front_deltas] == [1, 2]
+        for i in range(3, 7):
+            result = store.get_snapshot(i)
+            assert result is not None
+            assert result.entities[0].components[0].data == {"v": i}
+        assert store._front_deltas == []
+
+        # Evicting the last leading delta drops the evicted base entirely
+        store.record_tick(make_snapshot(7, [make_entity(1, A={"v": 7})]))
+        store.record_tick(make_snapshot(8, [make_entity(1, A={"v": 8})]))
+        assert store._front_base is None
+        assert store.stored_ticks == (5, 6, 7, 8)
+
     def test_clear(self):
         store = InMemoryHistoryStore()
         store.record_tick(make_snapshot(0, []))
@@ -257,6 +452,21 @@ class TestInMemoryHistoryStore:
         store.record_tick(snap)
         assert list(store.stored_ticks) == [1]
 
+    def test_duplicate_of_last_tick_does_not_warn(self, caplog):
+        import logging
+
+        caplog.set_level(logging.WARNING)
+        store = InMemoryHistoryStore(max_ticks=100, checkpoint_interval=10)
+        for i in range(3):
+            store.record_tick(make_snapshot(i, [make_entity(1, A={"v": i})]))
+        store.record_tick(make_snapshot(2, [make_entity(1, A={"v": 99})]))
+
+        assert list(store.stored_ticks) == [0, 1, 2]
+        result = store.get_snapshot(2)
+        assert result is not None
+        assert result.entities[0].components[0].data == {"v": 2}
+        assert "Ignoring out-of-order snapshot tick" not in caplog.text
+
     def test_out_of_order_tick_is_ignored(self, caplog):
         import logging
 
@@ -354,12 +564,39 @@ class TestErrorStorage:
         errors = store.get_errors(2, 4)
         assert len(errors) == 3
 
+    def test_out_of_order_errors_returned_in_tick_order(self):
+        store = InMemoryHistoryStore()
+        store.record_error(self._make_error(7, 1))
+        store.record_error(self._make_error(2, 1))
+        store.record_error(self._make_error(5, 1))
+
+        assert [e.tick for e in store.get_errors(0, 10)] == [2, 5, 7]
+        assert [e.tick for e in store.get_errors(3, 6)] == [5]
+        assert store.get_errors(8, 100) == []
+
+    def test_entity_errors_follow_ticks_and_eviction(self):
+        store = InMemoryHistoryStore(max_ticks=3, checkpoint_interval=5)
+        store.record_error(self._make_error(3, 1))
+        store.record_error(self._make_error(1, 1))
+        store.record_error(self._make_error(1, 2))
+        assert [e.tick for e in store.get_errors_for_entity(1, 0, 10)] == [1, 3]
+        assert [e.tick for e in store.get_errors_for_entity(1, 2, 10)] == [3]
+        assert store.get_errors_for_entity(3, 0, 10) == []
+
+        for i in range(5):
+            store.record_tick(make_snapshot(i, [make_entity(1, A={})]))
+
+        # Tick 1 was evicted; entity 2 has no errors left
+        assert [e.tick for e in store.get_errors_for_entity(1, 0, 10)] == [3]
+        assert store.get_errors_for_entity(2, 0, 10) == []
+
     def test_clear_removes_errors(self):
         store = InMemoryHistoryStore()
         store.record_tick(make_snapshot(0, [make_entity(1, A={})]))
         store.record_error(self._make_error(0, 1))
         store.clear()
         assert store.get_errors(0, 0) == []
+        assert store.get_errors_for_entity(1, 0, 0) == []
 
 
 class TestComputeEntityLifecycles:
@@ -397,10 +634,39 @@ class TestComputeEntityLifecycles:
         assert by_id[2]["spawn_tick"] == 10
         assert by_id[2]["despawn_tick"] is None
 
+    def test_changes_on_checkpoint_ticks(self):
+        store = InMemoryHistoryStore(max_ticks=100, checkpoint_interval=2)
+        store.record_tick(make_snapshot(0, [make_entity(1, A={})]))
+        store.record_tick(make_snapshot(1, [make_entity(1, A={}), make_entity(2, B={})]))
+        store.record_tick(make_snapshot(2, [make_entity(2, B={}), make_entity(3, A={}, C={})]))
+        store.record_tick(make_snapshot(3, [make_entity(3, A={}, C={})]))
+
+        by_id = {lc["entity_id"]: lc for lc in compute_entity_lifecycles(store)}
+
+        assert (by_id[1]["spawn_tick"], by_id[1]["despawn_tick"]) == (0, 2)
+        assert (by_id[2]["spawn_tick"], by_id[2]["despawn_tick"]) == (1, 3)
+        assert (by_id[3]["spawn_tick"], by_id[3]["despawn_tick"]) == (2, None)
+        assert by_id[3]["archetype"] == "A,C"
+
     def test_empty_store(self):
         store = InMemoryHistoryStore()
         assert compute_entity_lifecycles(store) == []
 
+    def test_cached_result_follows_new_ticks(self):
+        store = InMemoryHistoryStore(max_ticks=2, checkpoint_interval=10)
+        store.record_tick(make_snapshot(0, [make_entity(1, A={})]))
+        first = compute_entity_lifecycles(store)
+        # Callers get their own copies of the cached result
+        first[0]["despawn_tick"] = 99
+        assert compute_entity_lifecycles(store)[0]["despawn_tick"] is None
+
+        store.record_tick(make_snapshot(1, [make_entity(2, B={})]))
+        store.record_tick(make_snapshot(2, [make_entity(2, B={})]))
+        assert [lc["entity_id"] for lc in compute_entity_lifecycles(store)] == [2]
+
+        store.clear()
+        assert compute_entity_lifecycles(store) == []
+
 
 class TestSpanStorage:
     def _make_span(
@@ -489,6 +755,24 @@ class TestSpanStorage:
         assert len(spans) == 1
         assert spans[0].span_id == "s1"
 
+    def test_record_span_float_and_bool_ticks(self):
+        store = InMemoryHistoryStore()
+        store.record_tick(make_snapshot(0, [make_entity(1, A={})]))
+        for span_id, raw_tick in (("float", 3.0), ("bool", True)):
+            span = SpanEventMessage(
+                span_id=span_id,
+                trace_id="t1",
+                name="numeric tick",
+                start_time=1.0,
+                end_time=1.5,
+                status=SpanStatus.ok,
+                attributes={"agentecs.tick": raw_tick, "agentecs.entity_id": 1},
+            )
+            store.record_span(span)
+
+        assert [s.span_id for s in store.get_spans(3, 3)] == ["float"]
+        assert [s.span_id for s in store.get_spans(0, 0)] == ["bool"]
+
     def test_record_span_invalid_tick_falls_back_to_zero(self, caplog):
         import logging
 
@@ -7,6 +7,7 @@ from agentecs_viz.protocol import (
     ErrorEventMessage,
     SnapshotMessage,
     SpanEventMessage,
+    TickUpdateMessage,
 )
 from agentecs_viz.sources.mock import MockWorldSource
 
@@ -48,6 +49,76 @@ class TestMockWorldSource:
         finally:
             await source.disconnect()
 
+    async def test_updates_do_not_mutate_emitted_snapshots(self):
+        source = MockWorldSource(entity_count=20, seed=7)
+        await source.connect()
+        try:
+            await source.send_command("pause")
+            initial = await source.get_snapshot()
+            before = [entity.model_dump() for entity in initial.entities]
+            for _ in range(10):
+                await source.send_command("step")
+
+            assert [entity.model_dump() for entity in initial.entities] == before
+            historical = await source.get_snapshot(0)
+            assert [entity.model_dump() for entity in historical.entities] == before
+        finally:
+            await source.disconnect()
+
+    async def test_equal_static_components_are_shared(self):
+        source = MockWorldSource(entity_count=50, seed=7)
+        await source.connect()
+        try:
+            snapshot = await source.get_snapshot()
+            by_key: dict[tuple, list] = {}
+            for entity in snapshot.entities:
+                for component in entity.components:
+                    key = (component.type_short, tuple(sorted(component.data.items())))
+                    by_key.setdefault(key, []).append(component)
+            for (type_short, _), components in by_key.items():
+                if type_short == "Priority":
+                    assert all(c is components[0] for c in components)
+                elif type_short in ("Position", "Velocity"):
+                    assert len({id(c) for c in components}) == len(components)
+        finally:
+            await source.disconnect()
+
+    async def test_current_snapshot_reused_until_world_changes(self, source: MockWorldSource):
+        await source.connect()
+        try:
+            await source.send_command("pause")
+            paused = await source.get_snapshot()
+            assert paused.metadata["paused"] is True
+            assert await source.get_snapshot() is paused
+            assert await source.get_snapshot(source.get_current_tick()) is paused
+
+            await source.send_command("step")
+            stepped = await source.get_snapshot()
+            assert stepped is not paused
+            assert stepped.tick == paused.tick + 1
+
+            await source.send_command("resume")
+            assert (await source.get_snapshot()).metadata["paused"] is False
+        finally:
+            await source.disconnect()
+
+    async def test_agent_ids_follow_spawns_and_despawns(self):
+        source = MockWorldSource(entity_count=20, seed=3)
+        await source.connect()
+        try:
+            await source.send_command("pause")
+            ids_seen = {e.id for e in source._entities}
+            for _ in range(300):
+                await source.send_command("step")
+                ids_seen.update(e.id for e in source._entities)
+            current = {e.id for e in source._entities}
+            # Both spawns and despawns happened
+            assert ids_seen - current and current - set(range(20))
+            agent_ids = [e.id for e in source._entities if "Agent" in e.by_type()]
+            assert list(source._agent_ids) == agent_ids
+        finally:
+            await source.disconnect()
+
     async def test_get_snapshot_missing_historical_returns_current(self, source: MockWorldSource):
         await source.connect()
         try:
@@ -101,6 +172,78 @@ class TestMockWorldSource:
         finally:
             await source.disconnect()
 
+    async def test_disconnect_ends_idle_subscription(self, source: MockWorldSource):
+        await source.connect()
+        await source.send_command("pause")
+
+        async def drain() -> None:
+            async for _ in source.subscribe():
+                pass
+
+        task = asyncio.create_task(drain())
+        while not source._subscribers:
+            await asyncio.sleep(0)
+        await source.disconnect()
+        await asyncio.wait_for(task, timeout=1.0)
+
+    async def test_draining_a_backlog_lets_other_tasks_run(self, source: MockWorldSource):
+        await source.connect()
+        try:
+            await source.send_command("pause")
+            snapshot = await source.get_snapshot()
+            subscription = source.subscribe()
+            first = asyncio.ensure_future(anext(subscription))
+            while not source._subscribers:
+                await asyncio.sleep(0)
+            queue = next(iter(source._subscribers))
+            for _ in range(10):
+                queue.put_nowait(SnapshotMessage(tick=snapshot.tick, snapshot=snapshot))
+            await first
+
+            ticks = 0
+
+            async def other_task() -> None:
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(other_task())
+            await asyncio.sleep(0)
+            before = ticks
+            for _ in range(9):
+                await anext(subscription)
+            task.cancel()
+            assert ticks - before >= 8
+            await subscription.aclose()
+        finally:
+            await source.disconnect()
+
+    async def test_disconnect_ends_subscription_with_full_queue(self, source: MockWorldSource):
+        await source.connect()
+        await source.send_command("pause")
+        events: list[AnyServerEvent] = []
+
+        async def drain() -> None:
+            async for event in source.subscribe():
+                events.append(event)
+
+        task = asyncio.create_task(drain())
+        while not source._subscribers:
+            await asyncio.sleep(0)
+        queue = next(iter(source._subscribers))
+        tick = 0
+        while not queue.full():
+            tick += 1
+            queue.put_nowait(TickUpdateMessage(tick=tick, entity_count=0, is_paused=True))
+        await source.disconnect()
+        await asyncio.wait_for(task, timeout=1.0)
+
+        assert task.done()
+        # Tick 1 was evicted for the wake-up marker; the subscriber resumes with
+        # the next pending event and stops without delivering the backlog.
+        assert events == [TickUpdateMessage(tick=2, entity_count=0, is_paused=True)]
+
     async def test_visualization_config(self, source: MockWorldSource):
         assert source.visualization_config is not None
         assert source.visualization_config.world_name == "Mock World"
@@ -6,6 +6,7 @@ import pytest
 from agentecs_viz.config import VisualizationConfig
 from agentecs_viz.protocol import (
     AnyServerEvent,
+    BatchMessage,
     DeltaMessage,
     ErrorEventMessage,
     ErrorMessage,
@@ -74,6 +75,11 @@ class TestServerMessages:
         assert msg.type == "snapshot"
         assert msg.snapshot.tick == 5
 
+    def test_snapshot_message_wraps_snapshot_without_revalidating(self):
+        ws = WorldSnapshot(tick=5)
+        assert SnapshotMessage(tick=5, snapshot=ws).snapshot is ws
+        assert SnapshotResponseMessage(request_id="r", tick=5, snapshot=ws).snapshot is ws
+
     def test_snapshot_response_message(self):
         ws = WorldSnapshot(tick=5)
         msg = SnapshotResponseMessage(request_id="req-1", tick=5, snapshot=ws)
@@ -267,6 +273,20 @@ class TestSpanEventMessage:
         assert SpanStatus.unset == "unset"
 
 
+class TestBatchMessage:
+    def test_roundtrip_dispatches_events_by_type(self):
+        msg = BatchMessage(
+            events=[
+                TickUpdateMessage(tick=2, entity_count=1, is_paused=True),
+                ErrorMessage(tick=2, message="oops"),
+            ]
+        )
+        restored = BatchMessage.model_validate_json(msg.model_dump_json())
+        assert restored.type == "batch"
+        assert isinstance(restored.events[0], TickUpdateMessage)
+        assert isinstance(restored.events[1], ErrorMessage)
+
+
 class TestAnyServerEvent:
     def test_union_contains_all_message_types(self):
         expected = {
@@ -1,13 +1,67 @@
 import asyncio
-from collections.abc import AsyncGenerator
+import json
+from collections import deque
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
+from typing import Any
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from agentecs_viz.protocol import TickUpdateMessage
-from agentecs_viz.server import create_app
+import agentecs_viz.server as server_module
+from agentecs_viz.history import _apply_delta, compute_delta
+from agentecs_viz.protocol import (
+    BatchMessage,
+    DeltaMessage,
+    ErrorEventMessage,
+    SnapshotMessage,
+    TickUpdateMessage,
+)
+from agentecs_viz.server import (
+    _ClientStream,
+    _EventBuffer,
+    _EventEncoder,
+    _forward_events,
+    _frame,
+    create_app,
+)
+from agentecs_viz.snapshot import WorldSnapshot
 from agentecs_viz.sources.mock import MockWorldSource
 
+# Streamed snapshots arrive as deltas against the previous one, with periodic keyframes.
+_STREAMED_SNAPSHOT_TYPES = ("snapshot", "delta")
+
+
+class _MessageReader:
+    """Test WebSocket wrapper that returns streamed messages one at a time, unpacking batches.
+
+    Delta frames are passed through like any other message.
+    """
+
+    def __init__(self, ws: Any) -> None:
+        self._ws = ws
+        self._pending: deque[dict] = deque()
+
+    def receive_json(self) -> dict:
+        while not self._pending:
+            frame = self._ws.receive_json()
+            if frame["type"] != "batch":
+                return frame
+            self._pending.extend(frame["events"])
+        return self._pending.popleft()
+
+    def send_json(self, data: Any) -> None:
+        self._ws.send_json(data)
+
+    def send_text(self, data: str) -> None:
+        self._ws.send_text(data)
+
+
+@contextmanager
+def _connect(tc: Any) -> Iterator[_MessageReader]:
+    with tc.websocket_connect("/ws") as ws:
+        yield _MessageReader(ws)
+
 
 @pytest.fixture
 def source() -> MockWorldSource:
@@ -55,7 +109,7 @@ class TestWebSocket:
     def test_connect_receives_metadata_and_snapshot(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             # First message should be metadata
             msg1 = ws.receive_json()
             assert msg1["type"] == "metadata"
@@ -67,7 +121,7 @@ class TestWebSocket:
     def test_metadata_contains_protocol_properties(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             msg = ws.receive_json()
             assert msg["type"] == "metadata"
             assert "is_paused" in msg
@@ -80,12 +134,12 @@ class TestWebSocket:
         from starlette.testclient import TestClient
 
         app = create_app(source)
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             ws.receive_json()  # metadata
             ws.receive_json()  # initial snapshot
 
             # Build history via the WebSocket protocol (same event loop).
-            # Each step produces: tick_update (command ack) + snapshot
+            # Each step produces: tick_update (command ack) + snapshot or delta
             # (event subscription) + possible error_event/span_event.
             ws.send_json({"command": "pause"})
             ws.receive_json()  # tick_update ack for pause
@@ -99,7 +153,7 @@ class TestWebSocket:
                     msg = ws.receive_json()
                     if msg["type"] == "tick_update":
                         seen_tick_update = True
-                    elif msg["type"] == "snapshot":
+                    elif msg["type"] in _STREAMED_SNAPSHOT_TYPES:
                         seen_snapshot = True
                     if seen_tick_update and seen_snapshot:
                         break
@@ -118,7 +172,7 @@ class TestWebSocket:
         from starlette.testclient import TestClient
 
         app = create_app(source)
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             ws.receive_json()  # metadata
             ws.receive_json()  # initial snapshot
 
@@ -136,7 +190,7 @@ class TestWebSocket:
                     msg = ws.receive_json()
                     if msg["type"] == "tick_update":
                         seen_tick_update = True
-                    elif msg["type"] == "snapshot":
+                    elif msg["type"] in _STREAMED_SNAPSHOT_TYPES:
                         seen_snapshot = True
                     if seen_tick_update and seen_snapshot:
                         break
@@ -183,7 +237,7 @@ class TestWebSocket:
                 return snapshot
 
         app = create_app(BootstrapEventSource())
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             assert ws.receive_json()["type"] == "metadata"
             assert ws.receive_json()["type"] == "snapshot"
             assert ws.receive_json()["type"] == "tick_update"
@@ -227,21 +281,21 @@ class TestCommandValidation:
     def test_unknown_command_rejected(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             resp = self._send_and_expect_error(ws, {"command": "bogus"})
             assert "Invalid command" in resp["message"]
 
     def test_missing_command_field_rejected(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             resp = self._send_and_expect_error(ws, {"foo": "bar"})
             assert "Invalid command" in resp["message"]
 
     def test_set_speed_non_numeric_rejected(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             resp = self._send_and_expect_error(
                 ws, {"command": "set_speed", "ticks_per_second": "banana"}
             )
@@ -250,21 +304,21 @@ class TestCommandValidation:
     def test_seek_non_numeric_tick_rejected(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             resp = self._send_and_expect_error(ws, {"command": "seek", "tick": "not_a_number"})
             assert "Invalid command" in resp["message"]
 
     def test_seek_negative_tick_rejected(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             resp = self._send_and_expect_error(ws, {"command": "seek", "tick": -1})
             assert "Invalid command" in resp["message"]
 
     def test_set_speed_negative_rejected(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             resp = self._send_and_expect_error(
                 ws, {"command": "set_speed", "ticks_per_second": -1.0}
             )
@@ -273,7 +327,7 @@ class TestCommandValidation:
     def test_set_speed_zero_rejected(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             resp = self._send_and_expect_error(ws, {"command": "set_speed", "ticks_per_second": 0})
             assert "Invalid command" in resp["message"]
 
@@ -281,14 +335,23 @@ class TestCommandValidation:
         """Subscribe command was removed from the protocol."""
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             resp = self._send_and_expect_error(ws, {"command": "subscribe"})
             assert "Invalid command" in resp["message"]
 
+    def test_malformed_json_rejected(self, app):
+        from starlette.testclient import TestClient
+
+        with TestClient(app) as tc, _connect(tc) as ws:
+            self._pause_and_drain(ws)
+            ws.send_text("{not json")
+            resp = self._send_and_expect_type(ws, {"command": "pause"}, "error")
+            assert "Invalid command" in resp["message"]
+
     def test_valid_set_speed_accepted(self, app):
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             self._pause_and_drain(ws)
             ws.send_json({"command": "set_speed", "ticks_per_second": 5.0})
             resp = self._send_and_expect_type(ws, {"command": "pause"}, "tick_update")
@@ -298,9 +361,246 @@ class TestCommandValidation:
         """Error responses use the ErrorMessage model (have tick + type fields)."""
         from starlette.testclient import TestClient
 
-        with TestClient(app) as tc, tc.websocket_connect("/ws") as ws:
+        with TestClient(app) as tc, _connect(tc) as ws:
             resp = self._send_and_expect_error(ws, {"command": "bogus"})
             assert resp["type"] == "error"
             assert "tick" in resp
             assert isinstance(resp["tick"], int)
             assert "message" in resp
+
+
+class TestEventBatching:
+    def test_single_event_is_sent_unwrapped(self):
+        event = TickUpdateMessage(tick=1, entity_count=2, is_paused=False)
+        assert _frame([_EventEncoder().encode(event)]) == event.model_dump_json()
+
+    def test_multiple_events_share_one_frame_in_order(self):
+        events = [
+            TickUpdateMessage(tick=1, entity_count=2, is_paused=False),
+            ErrorEventMessage(tick=1, entity_id=3, message="boom"),
+        ]
+        encoder = _EventEncoder()
+        frame = _frame([encoder.encode(e) for e in events])
+        assert json.loads(frame) == json.loads(BatchMessage(events=events).model_dump_json())
+        assert [e["type"] for e in json.loads(frame)["events"]] == ["tick_update", "error_event"]
+
+    def test_event_is_encoded_once_for_several_connections(self):
+        event = TickUpdateMessage(tick=1, entity_count=2, is_paused=False)
+        encoder = _EventEncoder(max_bytes=len(event.model_dump_json()))
+        encoder.attach()
+        encoder.attach()
+        first = encoder.encode(event)
+        assert encoder.encode(event) is first
+        # Over the byte budget: the oldest entry is evicted
+        encoder.encode(TickUpdateMessage(tick=2, entity_count=2, is_paused=False))
+        assert encoder.encode(event) is not first
+
+    def test_single_connection_caches_nothing(self):
+        encoder = _EventEncoder()
+        encoder.attach()
+        event = TickUpdateMessage(tick=1, entity_count=2, is_paused=False)
+        assert encoder.encode(event) is not encoder.encode(event)
+
+    def test_cache_dropped_when_back_to_one_connection(self):
+        encoder = _EventEncoder()
+        encoder.attach()
+        encoder.attach()
+        event = TickUpdateMessage(tick=1, entity_count=2, is_paused=False)
+        first = encoder.encode(event)
+        encoder.detach()
+        assert encoder.encode(event) is not first
+
+
+def _tick(tick: int) -> TickUpdateMessage:
+    return TickUpdateMessage(tick=tick, entity_count=2, is_paused=False)
+
+
+def _drain(events: _EventBuffer) -> list[Any]:
+    return [events.get_nowait() for _ in range(events.qsize())]
+
+
+class TestEventBuffer:
+    async def test_full_buffer_replaces_pending_state(self):
+        events = _EventBuffer(3)
+        error = ErrorEventMessage(tick=1, entity_id=3, message="boom")
+        for event in (_tick(1), error, _tick(2)):
+            await events.put(event)
+        # Full: newer tick updates replace the pending one instead of waiting
+        await asyncio.wait_for(events.put(_tick(3)), timeout=1.0)
+        await asyncio.wait_for(events.put(_tick(4)), timeout=1.0)
+        assert _drain(events) == [_tick(1), error, _tick(4)]
+
+    async def test_snapshots_replaced_independently_of_other_events(self):
+        old, new = await _snapshots(2)
+        events = _EventBuffer(3)
+        error = ErrorEventMessage(tick=1, entity_id=3, message="boom")
+        for event in (SnapshotMessage(tick=old.tick, snapshot=old), _tick(1), error):
+            await events.put(event)
+        new_msg = SnapshotMessage(tick=new.tick, snapshot=new)
+        await asyncio.wait_for(events.put(new_msg), timeout=1.0)
+        assert _drain(events) == [_tick(1), error, new_msg]
+
+    async def test_snapshot_under_pending_delta_is_kept(self):
+        old, new = await _snapshots(2)
+        events = _EventBuffer(2)
+        delta = DeltaMessage(tick=new.tick, delta=compute_delta(old, new))
+        await events.put(SnapshotMessage(tick=old.tick, snapshot=old))
+        await events.put(delta)
+        put = asyncio.create_task(events.put(SnapshotMessage(tick=new.tick, snapshot=new)))
+        await asyncio.sleep(0)
+        assert not put.done()
+
+        assert events.get_nowait().snapshot == old
+        await asyncio.wait_for(put, timeout=1.0)
+        assert _drain(events)[0] is delta
+
+    async def test_history_and_end_marker_wait_for_room(self):
+        events = _EventBuffer(1)
+        await events.put(_tick(1))
+        error = asyncio.create_task(
+            events.put(ErrorEventMessage(tick=1, entity_id=3, message="boom"))
+        )
+        await asyncio.sleep(0)
+        assert not error.done()
+        assert await events.get() == _tick(1)
+        await asyncio.wait_for(error, timeout=1.0)
+
+        end = asyncio.create_task(events.put(None))
+        await asyncio.sleep(0)
+        assert not end.done()
+        assert isinstance(await events.get(), ErrorEventMessage)
+        await asyncio.wait_for(end, timeout=1.0)
+        assert await events.get() is None
+
+
+async def _snapshots(count: int) -> list[WorldSnapshot]:
+    source = MockWorldSource(entity_count=5, tick_interval=10.0)
+    await source.connect()
+    try:
+        await source.send_command("pause")
+        snapshots = [await source.get_snapshot()]
+        for _ in range(count - 1):
+            await source.send_command("step")
+            snapshots.append(await source.get_snapshot())
+    finally:
+        await source.disconnect()
+    return snapshots
+
+
+class _FakeWebSocket:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+
+
+class TestDeltaEncoding:
+    async def test_delta_applied_to_base_gives_snapshot(self):
+        base, snapshot = await _snapshots(2)
+        message = DeltaMessage.model_validate_json(_EventEncoder().encode_delta(base, snapshot))
+        assert message.tick == snapshot.tick
+        assert _apply_delta(base, message.delta) == snapshot
+
+    async def test_delta_encoded_once_for_several_connections(self, monkeypatch):
+        monkeypatch.setattr(server_module, "_ENCODED_DELTA_CACHE_SIZE", 1)
+        base, snapshot, later = await _snapshots(3)
+        encoder = _EventEncoder()
+        encoder.attach()
+        encoder.attach()
+        first = encoder.encode_delta(base, snapshot)
+        assert encoder.encode_delta(base, snapshot) is first
+        # Over the cache size: the oldest delta is evicted
+        encoder.encode_delta(snapshot, later)
+        assert encoder.encode_delta(base, snapshot) is not first
+
+    async def test_streamed_snapshots_are_deltas_against_the_last_sent(self):
+        snapshots = await _snapshots(3)
+        ws = _FakeWebSocket()
+        stream = _ClientStream(ws, _EventEncoder())  # type: ignore[arg-type]
+        await stream.send(SnapshotMessage(tick=snapshots[0].tick, snapshot=snapshots[0]))
+        for snapshot in snapshots[1:]:
+            await stream.send_events([SnapshotMessage(tick=snapshot.tick, snapshot=snapshot)])
+
+        assert [m["type"] for m in ws.sent] == ["snapshot", "delta", "delta"]
+        held = WorldSnapshot.model_validate(ws.sent[0]["snapshot"])
+        for message in ws.sent[1:]:
+            held = _apply_delta(held, DeltaMessage.model_validate(message).delta)
+        assert held == snapshots[-1]
+
+    async def test_keyframe_after_interval(self, monkeypatch):
+        monkeypatch.setattr(server_module, "_KEYFRAME_INTERVAL", 2)
+        snapshots = await _snapshots(5)
+        ws = _FakeWebSocket()
+        stream = _ClientStream(ws, _EventEncoder())  # type: ignore[arg-type]
+        for snapshot in snapshots:
+            await stream.send_events([SnapshotMessage(tick=snapshot.tick, snapshot=snapshot)])
+
+        assert [m["type"] for m in ws.sent] == ["snapshot", "delta", "delta", "snapshot", "delta"]
+
+    async def test_seek_resets_delta_base(self):
+        first, second, third = await _snapshots(3)
+        ws = _FakeWebSocket()
+        stream = _ClientStream(ws, _EventEncoder())  # type: ignore[arg-type]
+        await stream.send_events([SnapshotMessage(tick=second.tick, snapshot=second)])
+        # A seek reply replaces what the client holds
+        await stream.send(SnapshotMessage(tick=first.tick, snapshot=first))
+        await stream.send_events([SnapshotMessage(tick=third.tick, snapshot=third)])
+
+        delta = DeltaMessage.model_validate(ws.sent[-1]).delta
+        assert _apply_delta(first, delta) == third
+
+    async def test_source_delta_forces_keyframe(self):
+        first, second, third = await _snapshots(3)
+        ws = _FakeWebSocket()
+        stream = _ClientStream(ws, _EventEncoder())
+        await stream.send(SnapshotMessage(tick=first.tick, snapshot=first))
+        source_delta = DeltaMessage(tick=second.tick, delta=compute_delta(first, second))
+        await stream.send_events([source_delta])
+        await stream.send_events([SnapshotMessage(tick=third.tick, snapshot=third)])
+
+        assert [frame["type"] for frame in ws.sent] == ["snapshot", "delta", "snapshot"]
+        assert WorldSnapshot.model_validate(ws.sent[-1]["snapshot"]) == third
+
+
+class TestForwardEvents:
+    @staticmethod
+    async def _endless() -> AsyncGenerator[ErrorEventMessage, None]:
+        # Error events are never conflated, so a full buffer blocks the forwarder
+        tick = 0
+        while True:
+            tick += 1
+            yield ErrorEventMessage(tick=tick, entity_id=1, message="boom")
+
+    async def test_cancel_with_full_queue_does_not_hang(self):
+        events = _EventBuffer(2)
+        task = asyncio.create_task(_forward_events(self._endless(), events))
+        while not events.full():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)  # forwarder is now blocked on a full queue
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=1.0)
+        assert None not in _drain(events)
+
+    async def test_end_of_subscription_is_marked(self):
+        async def two() -> AsyncGenerator[TickUpdateMessage, None]:
+            for tick in (1, 2):
+                yield TickUpdateMessage(tick=tick, entity_count=0, is_paused=False)
+
+        events = _EventBuffer(4)
+        await _forward_events(two(), events)
+        items = _drain(events)
+        assert [item.tick for item in items[:2]] == [1, 2]
+        assert items[2] is None
+
+    async def test_failed_subscription_is_marked(self):
+        async def broken() -> AsyncGenerator[TickUpdateMessage, None]:
+            yield TickUpdateMessage(tick=1, entity_count=0, is_paused=False)
+            raise RuntimeError("source failed")
+
+        events = _EventBuffer(4)
+        with pytest.raises(RuntimeError):
+            await _forward_events(broken(), events)
+        assert events.qsize() == 2
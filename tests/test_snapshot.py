@@ -1,3 +1,6 @@
+import pytest
+from pydantic import ValidationError
+
 from agentecs_viz.snapshot import (
     ComponentDiff,
     ComponentSnapshot,
@@ -19,6 +22,18 @@ class TestComponentSnapshot:
         cs = ComponentSnapshot(type_name="mock.Empty", type_short="Empty")
         assert cs.data == {}
 
+    def test_frozen(self):
+        cs = ComponentSnapshot(type_name="mock.Empty", type_short="Empty")
+        with pytest.raises(ValidationError):
+            cs.type_short = "Other"
+
+    def test_type_names_interned(self):
+        raw = '{"type_name": "mock.Position", "type_short": "Position", "data": {}}'
+        a = ComponentSnapshot.model_validate_json(raw)
+        b = ComponentSnapshot.model_validate_json(raw)
+        assert a.type_short is b.type_short
+        assert a.type_name is b.type_name
+
 
 class TestEntitySnapshot:
     def test_archetype_computed(self):
@@ -30,10 +45,39 @@ class TestEntitySnapshot:
             ],
         )
         assert entity.archetype == ("Position", "Velocity")
+        assert entity.archetype is entity.archetype
+        assert entity.model_dump()["archetype"] == ("Position", "Velocity")
+
+    def test_archetype_rebuilt_after_model_copy(self):
+        entity = EntitySnapshot(
+            id=1,
+            components=[ComponentSnapshot(type_name="m.A", type_short="A", data={})],
+        )
+        assert entity.archetype == ("A",)
+        b = ComponentSnapshot(type_name="m.B", type_short="B", data={})
+        assert entity.model_copy(update={"components": [b]}).archetype == ("B",)
 
     def test_empty_components(self):
         entity = EntitySnapshot(id=0)
         assert entity.archetype == ()
+        assert entity.by_type() == {}
+
+    def test_by_type_index(self):
+        pos = ComponentSnapshot(type_name="mock.Position", type_short="Position", data={})
+        entity = EntitySnapshot(id=1, components=[pos])
+        assert entity.by_type() == {"Position": pos}
+        assert "_components_by_type" not in entity.model_dump()
+
+    def test_by_type_rebuilt_after_model_copy(self):
+        entity = EntitySnapshot(
+            id=1,
+            components=[ComponentSnapshot(type_name="m.A", type_short="A", data={})],
+        )
+        assert set(entity.by_type()) == {"A"}
+        b = ComponentSnapshot(type_name="m.B", type_short="B", data={})
+        copied = entity.model_copy(update={"components": [b]})
+        assert copied.by_type() == {"B": b}
+        assert set(entity.model_copy(deep=True).by_type()) == {"A"}
 
     def test_json_roundtrip(self):
         entity = EntitySnapshot(
@@ -121,6 +165,23 @@ class TestWorldSnapshot:
         ws2 = WorldSnapshot.model_validate(data)
         assert ws2.entity_count == 2
 
+    def test_by_id_index(self):
+        ws = WorldSnapshot(entities=[EntitySnapshot(id=4), EntitySnapshot(id=7)])
+        by_id = ws.by_id()
+        assert list(by_id) == [4, 7]
+        assert by_id[7] is ws.entities[1]
+        # The cached index is not part of equality or serialization
+        assert ws == WorldSnapshot(entities=[EntitySnapshot(id=4), EntitySnapshot(id=7)])
+        assert "_entities_by_id" not in ws.model_dump()
+
+    def test_by_id_rebuilt_after_model_copy(self):
+        ws = WorldSnapshot(entities=[EntitySnapshot(id=4)])
+        assert list(ws.by_id()) == [4]
+        copied = ws.model_copy(update={"entities": [EntitySnapshot(id=9)]})
+        assert list(copied.by_id()) == [9]
+        deep = ws.model_copy(deep=True)
+        assert deep.by_id()[4] is deep.entities[0]
+
 
 class TestComponentDiff:
     def test_added(self):